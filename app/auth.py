@@ -1,27 +1,147 @@
+import asyncio
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from app.cache import LRUTTLCache
 from app.config import settings
+from app.metrics import PASSWORD_HASH_DURATION
 from app.schemas import TokenData
 
 
+class HashingPoolSaturatedError(Exception):
+    """Raised when the password hashing pool has no free worker or queue slot"""
+    pass
+
+
+class PasswordHashingPool:
+    """Bounded thread pool for bcrypt work (bcrypt releases the GIL)"""
+    
+    def __init__(self, max_workers: int, queue_size: int):
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+        self.max_run_seconds = 0.0
+    
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run func in the pool, failing fast when all workers and queue slots are taken"""
+        if self._in_flight >= self.max_workers + self.queue_size:
+            self.rejected += 1
+            raise HashingPoolSaturatedError("Password hashing capacity exhausted")
+        
+        self._in_flight += 1
+        submitted = time.perf_counter()
+        
+        def timed_call():
+            started = time.perf_counter()
+            result = func(*args)
+            return result, started - submitted, time.perf_counter() - started
+        
+        try:
+            loop = asyncio.get_running_loop()
+            result, wait_seconds, run_seconds = await loop.run_in_executor(self._executor, timed_call)
+        finally:
+            self._in_flight -= 1
+        
+        self.completed += 1
+        self.total_wait_seconds += wait_seconds
+        self.total_run_seconds += run_seconds
+        self.max_run_seconds = max(self.max_run_seconds, run_seconds)
+        return result
+    
+    def stats(self) -> dict:
+        """Snapshot of pool size, occupancy and per-call timing"""
+        completed = self.completed or 1
+        return {
+            "workers": self.max_workers,
+            "queue_size": self.queue_size,
+            "in_flight": self._in_flight,
+            "queued": max(0, self._in_flight - self.max_workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait_seconds / completed * 1000, 3),
+            "avg_run_ms": round(self.total_run_seconds / completed * 1000, 3),
+            "max_run_ms": round(self.max_run_seconds * 1000, 3),
+        }
+    
+    def shutdown(self):
+        """Stop accepting work and release the worker threads"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
 class AuthService:
     """Service class for authentication operations"""
     
     def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        # Stored hashes with a different cost are flagged by needs_update and rehashed on login
+        self.pwd_context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__rounds=settings.PASSWORD_HASH_ROUNDS
+        )
+        self.hashing_pool = PasswordHashingPool(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            queue_size=settings.PASSWORD_HASH_QUEUE_SIZE
+        )
         self.secret_key = settings.SECRET_KEY
         self.algorithm = settings.ALGORITHM
         self.access_token_expire_minutes = settings.ACCESS_TOKEN_EXPIRE_MINUTES
+        # Already-verified tokens keyed by digest; each entry expires with its token
+        self.token_cache = LRUTTLCache(
+            max_size=settings.TOKEN_CACHE_SIZE,
+            ttl_seconds=self.access_token_expire_minutes * 60
+        )
+    
+    def reset_after_fork(self):
+        """Replace the hashing pool inherited from the parent; its threads do not survive a fork"""
+        self.hashing_pool = PasswordHashingPool(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            queue_size=settings.PASSWORD_HASH_QUEUE_SIZE
+        )
     
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a plain password against a hashed password"""
-        return self.pwd_context.verify(plain_password, hashed_password)
+        with PASSWORD_HASH_DURATION.labels("verify").time():
+            return self.pwd_context.verify(plain_password, hashed_password)
     
     def get_password_hash(self, password: str) -> str:
         """Hash a password using bcrypt"""
-        return self.pwd_context.hash(password)
+        with PASSWORD_HASH_DURATION.labels("hash").time():
+            return self.pwd_context.hash(password)
+    
+    def verify_and_rehash(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password and, when the stored hash uses an outdated cost,
+        hash it again at PASSWORD_HASH_ROUNDS.
+        
+        Returns (verified, new_hash); new_hash is None unless a rehash was done.
+        """
+        if not self.verify_password(plain_password, hashed_password):
+            return False, None
+        if not self.pwd_context.needs_update(hashed_password):
+            return True, None
+        return True, self.get_password_hash(plain_password)
+    
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password on the hashing pool without blocking the event loop"""
+        return await self.hashing_pool.run(self.verify_password, plain_password, hashed_password)
+    
+    async def verify_and_rehash_async(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """verify_and_rehash on the hashing pool (verify and rehash share one pool slot)"""
+        return await self.hashing_pool.run(self.verify_and_rehash, plain_password, hashed_password)
+    
+    async def get_password_hash_async(self, password: str) -> str:
+        """Hash a password on the hashing pool without blocking the event loop"""
+        return await self.hashing_pool.run(self.get_password_hash, password)
     
     def create_access_token(
         self, 
@@ -44,21 +164,104 @@ class AuthService:
         """Decode and verify a JWT access token"""
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            admin_id: str = payload.get("admin_id")
-            organization_id: str = payload.get("organization_id")
-            email: str = payload.get("email")
-            
-            if admin_id is None or organization_id is None:
-                return None
-            
-            return TokenData(
-                admin_id=admin_id,
-                organization_id=organization_id,
-                email=email
-            )
+            return self._token_data_from_payload(payload)
         except JWTError:
             return None
-
+    
+    def decode_access_token_cached(self, token: str) -> Optional[TokenData]:
+        """
+        Decode and verify a JWT access token, reusing an earlier verification.
+        
+        Valid tokens are cached by SHA-256 digest until their own exp, so
+        repeat requests with the same bearer token skip the HMAC check,
+        JSON parsing and TokenData construction. Invalid tokens are never
+        cached.
+        """
+        key = hashlib.sha256(token.encode()).digest()
+        token_data = self.token_cache.get(key)
+        if token_data is not None:
+            return token_data
+        
+        try:
+            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        except JWTError:
+            return None
+        
+        token_data = self._token_data_from_payload(payload)
+        expires_at = payload.get("exp")
+        if token_data is not None and isinstance(expires_at, (int, float)):
+            remaining = expires_at - time.time()
+            if remaining > 0:
+                self.token_cache.set(key, token_data, ttl_seconds=remaining)
+        return token_data
+    
+    def _token_data_from_payload(self, payload: dict) -> Optional[TokenData]:
+        """Build TokenData from a verified payload, or None if claims are missing"""
+        admin_id: str = payload.get("admin_id")
+        organization_id: str = payload.get("organization_id")
+        email: str = payload.get("email")
+        
+        if admin_id is None or organization_id is None:
+            return None
+        
+        return TokenData(
+            admin_id=admin_id,
+            organization_id=organization_id,
+            email=email
+        )
 
 # Singleton instance
 auth_service = AuthService()
+
+# Each forked worker gets its own hashing pool
+os.register_at_fork(after_in_child=auth_service.reset_after_fork)
+
+
+def measure_rounds(rounds: int, samples: int = 5) -> float:
+    """Median seconds for one bcrypt verify at the given cost on this machine"""
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+    hashed = context.hash("calibration-password")
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.verify("calibration-password", hashed)
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2]
+
+
+def calibrate_rounds(target_ms: float, min_rounds: int = 4, max_rounds: int = 20, samples: int = 5) -> Tuple[int, dict]:
+    """
+    Highest bcrypt cost whose verify time stays within target_ms here.
+    
+    Each extra round doubles the work, so rounds are tried upwards until
+    the target is exceeded. Returns (rounds, {rounds: verify_ms}); if even
+    min_rounds is too slow, min_rounds is returned.
+    """
+    timings = {}
+    chosen = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        timings[rounds] = round(measure_rounds(rounds, samples) * 1000, 3)
+        if timings[rounds] > target_ms:
+            break
+        chosen = rounds
+    return chosen, timings
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Password hashing commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+    calibrate = commands.add_parser("calibrate", help="Pick PASSWORD_HASH_ROUNDS for a target verify latency")
+    calibrate.add_argument("--target-ms", type=float, default=250.0, help="Verify latency budget per login")
+    calibrate.add_argument("--samples", type=int, default=5, help="Timed verifies per cost")
+    args = parser.parse_args()
+    
+    rounds, timings = calibrate_rounds(args.target_ms, samples=args.samples)
+    for cost, verify_ms in timings.items():
+        marker = " <-" if cost == rounds else ""
+        print(f"  rounds={cost:<2}  verify {verify_ms:9.3f} ms{marker}")
+    capacity = settings.PASSWORD_HASH_WORKERS * 1000 / timings[rounds]
+    print(f"PASSWORD_HASH_ROUNDS={rounds}")
+    print(f"  current setting: {settings.PASSWORD_HASH_ROUNDS}")
+    print(f"  ~{capacity:.0f} verifies/s per worker process with PASSWORD_HASH_WORKERS={settings.PASSWORD_HASH_WORKERS}")
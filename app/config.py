@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -8,13 +8,101 @@ class Settings(BaseSettings):
     # MongoDB Configuration
     MONGODB_URL: str = "mongodb://localhost:27017"
     MASTER_DB_NAME: str = "master_organization_db"
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 0
+    MONGODB_MAX_IDLE_TIME_MS: Optional[int] = None
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = None
+    MONGODB_CONNECT_TIMEOUT_MS: int = 20000
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 30000
+    # Comma-separated wire compressors, e.g. "zstd,snappy,zlib" (empty disables)
+    MONGODB_COMPRESSORS: str = ""
+    # Write org + admin in one transaction on replica sets (adds a commit round trip)
+    MONGODB_USE_TRANSACTIONS: bool = False
     
     # JWT Configuration
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    TOKEN_CACHE_SIZE: int = 10000
+    
+    # Password Hashing Configuration
+    # bcrypt cost (each step doubles the work); pick one with: python -m app.auth calibrate
+    PASSWORD_HASH_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    
+    # Rate Limit Configuration
+    # Token buckets in front of password checks (admin login, organization rename):
+    # BURST attempts at once, refilled at PER_MINUTE
+    RATE_LIMIT_ENABLED: bool = True
+    # Where buckets live: this process ("memory") or the master database ("mongodb", shared by all workers)
+    RATE_LIMIT_BACKEND: Literal["memory", "mongodb"] = "memory"
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    # Take the client address from X-Forwarded-For (only behind a proxy that sets it),
+    # counting TRUSTED_PROXY_HOPS entries from the right: the entries our proxies appended
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = False
+    RATE_LIMIT_TRUSTED_PROXY_HOPS: int = 1
+    LOGIN_RATE_LIMIT_IP_BURST: int = 20
+    LOGIN_RATE_LIMIT_IP_PER_MINUTE: float = 30.0
+    LOGIN_RATE_LIMIT_EMAIL_BURST: int = 5
+    LOGIN_RATE_LIMIT_EMAIL_PER_MINUTE: float = 5.0
+    
+    # Tenant Data Configuration
+    TENANT_COPY_BATCH_SIZE: int = 1000
+    TENANT_QUERY_MAX_LIMIT: int = 1000
+    TENANT_EXPORT_BATCH_SIZE: int = 1000
+    TENANT_IMPORT_BATCH_SIZE: int = 1000
+    TENANT_IMPORT_MAX_IN_FLIGHT: int = 4
+    # Where new organizations keep their documents: a collection each ("collection")
+    # or one collection shared by all tenants ("shared"); overridable per organization
+    TENANT_STORAGE_MODE: Literal["collection", "shared"] = "collection"
+    TENANT_SHARED_COLLECTION: str = "tenant_documents"
+    
+    # Tenant Placement Configuration
+    # Extra clusters for tenant collections, as JSON {"name": "mongodb://host:port/database"};
+    # the cluster behind MONGODB_URL is always available as "primary"
+    TENANT_CLUSTERS: Dict[str, str] = {}
+    # Cluster that new organizations are placed on
+    TENANT_DEFAULT_CLUSTER: str = "primary"
+    TENANT_PLACEMENT_CACHE_TTL_SECONDS: float = 30.0
+    
+    # Background Job Configuration
+    # Jobs of each type run at once per worker process
+    JOB_DELETE_CONCURRENCY: int = 2
+    JOB_EXPORT_CONCURRENCY: int = 2
+    JOB_HEARTBEAT_SECONDS: float = 10.0
+    # A running job whose heartbeat is older than this is taken over by another worker
+    JOB_STALE_SECONDS: float = 60.0
+    JOB_MAX_ATTEMPTS: int = 3
+    # Finished jobs and export files are kept this long
+    JOB_RETENTION_HOURS: float = 24.0
+    
+    # Organization Cache Configuration (size 0 disables the cache)
+    ORG_CACHE_SIZE: int = 10000
+    ORG_CACHE_TTL_SECONDS: float = 60.0
+    ORG_CACHE_WARM_LIMIT: int = 1000
+    
+    # Organization Listing and Bulk Configuration
+    ORG_LIST_DEFAULT_PAGE_SIZE: int = 100
+    ORG_LIST_MAX_PAGE_SIZE: int = 1000
+    ORG_BULK_CREATE_MAX_ITEMS: int = 1000
+    
+    # Metrics Configuration
+    METRICS_ENABLED: bool = True
+    EVENT_LOOP_LAG_INTERVAL_SECONDS: float = 0.5
+    
+    # Health Check Configuration
+    HEALTH_CHECK_INTERVAL_SECONDS: float = 5.0
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 2.0
+    
+    # Server Configuration
+    # Worker processes started by gunicorn.conf.py (0 = one per CPU core).
+    # Pool sizes above are per worker process.
+    WORKERS: int = 1
     
     # Application Configuration
+    # Seed demo organizations in the background after startup (or run: python -m app.seed_data)
+    SEED_DEMO_DATA: bool = True
     APP_NAME: str = "Organization Management Service"
     DEBUG: bool = True
     
@@ -1,71 +1,266 @@
-from pymongo import MongoClient
-from pymongo.database import Database
-from pymongo.collection import Collection
+import os
+from pymongo import AsyncMongoClient, ASCENDING, DESCENDING
+from pymongo.errors import BulkWriteError, CollectionInvalid, OperationFailure
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.asynchronous.collection import AsyncCollection
 from app.config import settings
-from typing import Optional
+from app.monitoring import pool_metrics, command_metrics
+from typing import Callable, Dict, Optional, Set, Tuple
+
+
+# Server error codes used when moving collections
+NAMESPACE_NOT_FOUND = 26
+NAMESPACE_EXISTS = 48
+DUPLICATE_KEY = 11000
 
 
 class DatabaseConnection:
-    """Singleton class for managing MongoDB connections"""
+    """Singleton class for managing async MongoDB connections"""
     
     _instance: Optional["DatabaseConnection"] = None
-    _client: Optional[MongoClient] = None
-    _master_db: Optional[Database] = None
+    _client: Optional[AsyncMongoClient] = None
+    _master_db: Optional[AsyncDatabase] = None
+    # Known collection names per (client, database), loaded at startup and kept current
+    _collections: Dict[Tuple[int, str], Set[str]] = {}
+    # Set on connect: True when the deployment is a replica set or sharded cluster
+    supports_transactions: bool = False
     
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(DatabaseConnection, cls).__new__(cls)
         return cls._instance
     
-    def __init__(self):
-        if self._client is None:
-            self.connect()
+    def _create_client(self):
+        """Create the async client (no network I/O happens until first use)"""
+        self._client = self.create_client(settings.MONGODB_URL)
+        self._master_db = self._client[settings.MASTER_DB_NAME]
+        self._collections = {}
+    
+    def create_client(self, url: str) -> AsyncMongoClient:
+        """Build a client for url with the configured pool, timeout and monitoring options"""
+        return AsyncMongoClient(url, **self._client_options())
+    
+    def _client_options(self) -> dict:
+        """Pool, timeout and compression options from settings"""
+        options = {
+            "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+            "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+            "connectTimeoutMS": settings.MONGODB_CONNECT_TIMEOUT_MS,
+            "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+            "event_listeners": [pool_metrics, command_metrics],
+        }
+        if settings.MONGODB_MAX_IDLE_TIME_MS is not None:
+            options["maxIdleTimeMS"] = settings.MONGODB_MAX_IDLE_TIME_MS
+        if settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS is not None:
+            options["waitQueueTimeoutMS"] = settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS
+        if settings.MONGODB_COMPRESSORS:
+            options["compressors"] = settings.MONGODB_COMPRESSORS
+        return options
     
-    def connect(self):
-        """Establish connection to MongoDB"""
+    def reset_after_fork(self):
+        """
+        Forget a client inherited from the parent process.
+        
+        MongoClient sockets and monitor tasks must not be shared across a
+        fork; the child builds its own client on first use.
+        """
+        self._client = None
+        self._master_db = None
+        self._collections = {}
+        self.supports_transactions = False
+    
+    async def connect(self):
+        """Verify the connection and load deployment facts (the client itself is created lazily)"""
         try:
-            self._client = MongoClient(settings.MONGODB_URL)
-            self._master_db = self._client[settings.MASTER_DB_NAME]
+            if self._client is None:
+                self._create_client()
             # Test connection
-            self._client.server_info()
+            await self._client.server_info()
             print(f"Connected to MongoDB: {settings.MONGODB_URL}")
+            hello = await self._client.admin.command("hello")
+            self.supports_transactions = "setName" in hello or hello.get("msg") == "isdbgrid"
+            await self.load_collection_registry()
         except Exception as e:
             print(f"Error connecting to MongoDB: {e}")
             raise
     
-    def get_master_db(self) -> Database:
+    def get_master_db(self) -> AsyncDatabase:
         """Get the master database instance"""
         if self._master_db is None:
-            self.connect()
+            self._create_client()
         return self._master_db
     
-    def get_collection(self, collection_name: str, database: Optional[Database] = None) -> Collection:
+    def get_collection(self, collection_name: str, database: Optional[AsyncDatabase] = None) -> AsyncCollection:
         """Get a collection from the database"""
-        db = database or self._master_db
+        db = database or self.get_master_db()
         return db[collection_name]
     
-    def create_collection(self, collection_name: str, database: Optional[Database] = None):
-        """Create a new collection in the database"""
-        db = database or self._master_db
-        if collection_name not in db.list_collection_names():
-            db.create_collection(collection_name)
+    async def load_collection_registry(self, database: Optional[AsyncDatabase] = None):
+        """Populate the in-memory collection registry with one listCollections call"""
+        db = database or self.get_master_db()
+        registry = self._collections[self._registry_key(db)] = set(await db.list_collection_names())
+        print(f"Loaded {len(registry)} collection names from {db.name}")
+    
+    def _registry_key(self, db: AsyncDatabase) -> Tuple[int, str]:
+        """Databases with the same name on different clusters are tracked separately"""
+        return id(db.client), db.name
+    
+    def _registry(self, db: AsyncDatabase) -> Set[str]:
+        """Registry entry for a database (empty until loaded or written to)"""
+        return self._collections.setdefault(self._registry_key(db), set())
+    
+    async def create_collection(self, collection_name: str, database: Optional[AsyncDatabase] = None) -> bool:
+        """
+        Create a new collection in the database.
+        
+        Checks the in-memory registry instead of listing collections, and
+        sends create without PyMongo's own listCollections check, so a new
+        collection costs one round trip. The registry may miss collections
+        created by other processes; the server's NamespaceExists error (or
+        CollectionInvalid) then means it already exists.
+        Returns True only if this call created the collection.
+        """
+        db = database or self.get_master_db()
+        registry = self._registry(db)
+        if collection_name in registry:
+            print(f"Collection already exists: {collection_name}")
+            return False
+        
+        created = False
+        try:
+            await db.create_collection(collection_name, check_exists=False)
+            created = True
             print(f"Created collection: {collection_name}")
-        else:
+        except CollectionInvalid:
+            print(f"Collection already exists: {collection_name}")
+        except OperationFailure as e:
+            if e.code != NAMESPACE_EXISTS:
+                raise
             print(f"Collection already exists: {collection_name}")
+        registry.add(collection_name)
+        return created
+    
+    async def drop_collection(self, collection_name: str, database: Optional[AsyncDatabase] = None):
+        """Drop a collection from the database (a no-op if it does not exist)"""
+        db = database or self.get_master_db()
+        await db.drop_collection(collection_name)
+        self._registry(db).discard(collection_name)
+        print(f"Dropped collection: {collection_name}")
+    
+    async def rename_collection(
+        self,
+        old_name: str,
+        new_name: str,
+        database: Optional[AsyncDatabase] = None,
+        progress: Optional[Callable[[int, int], None]] = None
+    ) -> str:
+        """
+        Move a collection to a new name.
+        
+        Uses the server-side renameCollection command so no documents pass
+        through this process. If the server refuses (for example because the
+        target is left over from an interrupted copy), falls back to a
+        resumable streaming copy followed by dropping the source.
+        Returns "renamed", "copied" or "created" (source did not exist).
+        """
+        db = database or self.get_master_db()
+        try:
+            await db[old_name].rename(new_name)
+            self._registry(db).discard(old_name)
+            self._registry(db).add(new_name)
+            print(f"Renamed collection: {old_name} -> {new_name}")
+            return "renamed"
+        except OperationFailure as e:
+            if e.code == NAMESPACE_NOT_FOUND:
+                await self.create_collection(new_name, db)
+                return "created"
+            print(f"renameCollection not possible ({e}), copying {old_name} -> {new_name}")
+        
+        await self.copy_collection(old_name, new_name, db, progress=progress)
+        self._registry(db).add(new_name)
+        await self.drop_collection(old_name, db)
+        return "copied"
     
-    def drop_collection(self, collection_name: str, database: Optional[Database] = None):
-        """Drop a collection from the database"""
-        db = database or self._master_db
-        if collection_name in db.list_collection_names():
-            db.drop_collection(collection_name)
-            print(f"Dropped collection: {collection_name}")
+    async def copy_collection(
+        self,
+        source_name: str,
+        target_name: str,
+        database: Optional[AsyncDatabase] = None,
+        batch_size: Optional[int] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+        target_database: Optional[AsyncDatabase] = None,
+        query: Optional[dict] = None
+    ) -> int:
+        """
+        Stream documents from one collection into another in _id order.
+        
+        The target may be in another database or cluster (target_database,
+        defaulting to the source database), and query limits the copy to
+        matching documents. At most one batch is held in memory. The copy
+        resumes after the highest matching _id already present in the target,
+        so an interrupted copy can simply be re-run. progress(copied, total)
+        is called after each batch.
+        Returns the number of documents in the target when done.
+        """
+        db = database or self.get_master_db()
+        batch_size = batch_size or settings.TENANT_COPY_BATCH_SIZE
+        source = db[source_name]
+        target = (target_database if target_database is not None else db)[target_name]
+        
+        query = query or {}
+        total = await source.count_documents(query) if query else await source.estimated_document_count()
+        last_doc = await target.find_one(query, projection={"_id": 1}, sort=[("_id", DESCENDING)])
+        copied = await target.count_documents(query) if last_doc else 0
+        if last_doc:
+            query = {**query, "_id": {"$gt": last_doc["_id"]}}
+        
+        batch = []
+        cursor = source.find(query, sort=[("_id", ASCENDING)], batch_size=batch_size)
+        async for document in cursor:
+            batch.append(document)
+            if len(batch) >= batch_size:
+                copied += await self._insert_batch(target, batch)
+                batch = []
+                if progress:
+                    progress(copied, total)
+        if batch:
+            copied += await self._insert_batch(target, batch)
+            if progress:
+                progress(copied, total)
+        
+        if target_database is not None:
+            self._registry(target_database).add(target_name)
+        print(f"Copied {copied} documents: {source_name} -> {target_name}")
+        return copied
     
-    def close(self):
+    async def _insert_batch(self, collection: AsyncCollection, batch: list) -> int:
+        """Insert a batch, treating already-copied documents as done"""
+        try:
+            result = await collection.insert_many(batch, ordered=False)
+            return len(result.inserted_ids)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != DUPLICATE_KEY for error in errors):
+                raise
+            return e.details.get("nInserted", 0)
+    
+    def start_session(self):
+        """Start a client session (use with async with)"""
+        if self._client is None:
+            self._create_client()
+        return self._client.start_session()
+    
+    async def close(self):
         """Close the MongoDB connection"""
         if self._client:
-            self._client.close()
+            await self._client.close()
+            self._client = None
+            self._master_db = None
             print("MongoDB connection closed")
 
 
 # Singleton instance
 db_connection = DatabaseConnection()
+
+# Each forked worker gets its own client (e.g. gunicorn with preload_app)
+os.register_at_fork(after_in_child=db_connection.reset_after_fork)
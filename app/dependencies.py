@@ -20,7 +20,7 @@ async def get_current_admin(
     )
     
     token = credentials.credentials
-    token_data = auth_service.decode_access_token(token)
+    token_data = auth_service.decode_access_token_cached(token)
     
     if token_data is None:
         raise credentials_exception
@@ -37,6 +37,6 @@ async def get_optional_current_admin(
         return None
     
     token = credentials.credentials
-    token_data = auth_service.decode_access_token(token)
+    token_data = auth_service.decode_access_token_cached(token)
     
     return token_data
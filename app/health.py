@@ -0,0 +1,113 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, Optional
+from app.database import db_connection
+
+
+class HealthMonitor:
+    """Background MongoDB heartbeat whose latest result is served from memory"""
+    
+    def __init__(self):
+        self.database_status = "unknown"
+        self.last_rtt_ms: Optional[float] = None
+        self.last_checked_at: Optional[datetime] = None
+        self.topology: dict = {}
+        # Startup work that must finish before the instance reports ready
+        self.startup_steps: Dict[str, bool] = {}
+        # Startup steps that failed in a way retrying cannot fix, with the reason
+        self.startup_errors: Dict[str, str] = {}
+        self._task: Optional[asyncio.Task] = None
+    
+    async def check_once(self, timeout_seconds: float):
+        """Ping MongoDB once and record status, round-trip time and topology"""
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(db_connection.get_master_db().command("ping"), timeout_seconds)
+            self.last_rtt_ms = round((time.perf_counter() - start) * 1000, 3)
+            self.database_status = "connected"
+        except asyncio.TimeoutError:
+            self.database_status = f"disconnected: ping timed out after {timeout_seconds}s"
+        except Exception as e:
+            self.database_status = f"disconnected: {str(e)}"
+        self.last_checked_at = datetime.utcnow()
+        try:
+            self.topology = self._describe_topology()
+        except Exception:
+            # Not connected yet (or a client without topology information)
+            self.topology = {}
+    
+    def _describe_topology(self) -> dict:
+        """Summarise the driver's current view of the deployment"""
+        client = db_connection.get_master_db().client
+        description = client.topology_description
+        return {
+            "type": description.topology_type_name,
+            "servers": [
+                {
+                    "address": f"{host}:{port}",
+                    "type": server.server_type_name,
+                    "rtt_ms": round(server.round_trip_time * 1000, 3) if server.round_trip_time is not None else None
+                }
+                for (host, port), server in description.server_descriptions().items()
+            ]
+        }
+    
+    async def _run(self, interval_seconds: float, timeout_seconds: float):
+        while True:
+            await self.check_once(timeout_seconds)
+            await asyncio.sleep(interval_seconds)
+    
+    def start(self, interval_seconds: float, timeout_seconds: float):
+        """Start the heartbeat task on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(interval_seconds, timeout_seconds))
+    
+    def stop(self):
+        """Cancel the heartbeat task"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+    
+    def begin_step(self, name: str):
+        """Register a startup step that has to complete before the instance is ready"""
+        self.startup_steps[name] = False
+    
+    def complete_step(self, name: str):
+        """Mark a startup step as finished"""
+        self.startup_steps[name] = True
+    
+    def fail_step(self, name: str, error: str):
+        """Record a startup step that cannot complete until an operator intervenes"""
+        self.startup_errors[name] = error
+    
+    @property
+    def is_healthy(self) -> bool:
+        return self.database_status == "connected"
+    
+    @property
+    def is_ready(self) -> bool:
+        return bool(self.startup_steps) and all(self.startup_steps.values()) and self.is_healthy
+    
+    def health(self) -> dict:
+        """Cached database health, without touching the network"""
+        return {
+            "status": "healthy" if self.is_healthy else "unhealthy",
+            "database": self.database_status,
+            "database_rtt_ms": self.last_rtt_ms,
+            "checked_at": self.last_checked_at.isoformat() if self.last_checked_at else None,
+            "topology": self.topology,
+        }
+    
+    def readiness(self) -> dict:
+        """Startup progress and whether the instance should receive traffic"""
+        return {
+            "ready": self.is_ready,
+            "database": self.database_status,
+            "startup_steps": dict(self.startup_steps),
+            "startup_errors": dict(self.startup_errors),
+        }
+
+
+# Singleton instance
+health_monitor = HealthMonitor()
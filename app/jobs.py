@@ -0,0 +1,393 @@
+import asyncio
+import json
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional
+from bson import ObjectId
+from gridfs import AsyncGridFSBucket
+from gridfs.errors import NoFile
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.errors import DuplicateKeyError
+from app.config import settings
+from app.database import db_connection
+from app.services import organization_service
+from app.tenant_data import tenant_data_service
+
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# Job types
+DELETE_ORGANIZATION = "delete_organization"
+EXPORT_DOCUMENTS = "export_documents"
+
+# GridFS bucket in the master database holding export job output
+EXPORT_BUCKET = "job_exports"
+
+# Progress is written to the job document at most this often
+PROGRESS_WRITE_INTERVAL_SECONDS = 1.0
+
+
+class JobProgress:
+    """Handed to a job handler to report how far it has got"""
+    
+    def __init__(self, runner: "JobRunner", job_id: ObjectId, total: Optional[int] = None):
+        self._runner = runner
+        self._job_id = job_id
+        self.done = 0
+        self.total = total
+        self._written_at = 0.0
+    
+    async def update(self, done: int, total: Optional[int] = None, force: bool = False):
+        """Record progress; written to the job document at most once a second"""
+        self.done = done
+        if total is not None:
+            self.total = total
+        now = time.monotonic()
+        if force or now - self._written_at >= PROGRESS_WRITE_INTERVAL_SECONDS:
+            self._written_at = now
+            await self._runner._update_owned(
+                self._job_id, {"progress": {"done": self.done, "total": self.total}}
+            )
+
+
+# A handler gets the job document and its progress reporter and returns the job result
+JobHandler = Callable[[dict, JobProgress], Awaitable[Optional[dict]]]
+
+
+class JobRunner:
+    """
+    In-process runner for long tenant operations.
+    
+    Jobs are documents in the master database's jobs collection, so any
+    worker can report on them. submit() records a job and starts it in this
+    process; each job type runs at most its configured number of jobs at a
+    time per worker. A running job is claimed by one worker (owner) which
+    refreshes its heartbeat every JOB_HEARTBEAT_SECONDS. Every worker also
+    sweeps for jobs left behind: queued jobs nobody started and running
+    jobs whose heartbeat is older than JOB_STALE_SECONDS are claimed and
+    run again, so handlers must be safe to restart. A graceful shutdown
+    puts its running jobs back in the queue so they resume at once.
+    """
+    
+    def __init__(self):
+        self._handlers: Dict[str, JobHandler] = {}
+        self._limits: Dict[str, int] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._tasks: Dict[ObjectId, asyncio.Task] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+        self.owner = self._process_owner()
+    
+    @staticmethod
+    def _process_owner() -> str:
+        return f"{socket.gethostname()}:{os.getpid()}"
+    
+    def reset_after_fork(self):
+        """Give a forked worker its own owner id and no tasks inherited from the parent"""
+        self.owner = self._process_owner()
+        self._semaphores = {}
+        self._tasks = {}
+        self._sweeper = None
+    
+    @property
+    def jobs_collection(self) -> AsyncCollection:
+        return db_connection.get_collection("jobs")
+    
+    def register(self, job_type: str, handler: JobHandler, concurrency: int):
+        """Add a job type, run by handler with at most concurrency jobs at once per worker"""
+        self._handlers[job_type] = handler
+        self._limits[job_type] = concurrency
+    
+    async def ensure_indexes(self):
+        """Create the jobs collection indexes (idempotent, run at startup)"""
+        await self.jobs_collection.create_index(
+            [("state", ASCENDING), ("heartbeat_at", ASCENDING)], name="state_heartbeat"
+        )
+        await self.jobs_collection.create_index([("finished_at", ASCENDING)], name="finished_at", sparse=True)
+        # Set only while a deduplicated job is queued or running
+        await self.jobs_collection.create_index(
+            [("active_key", ASCENDING)], unique=True, sparse=True, name="active_key_unique"
+        )
+    
+    async def submit(
+        self,
+        job_type: str,
+        organization_id: str,
+        params: Optional[dict] = None,
+        total: Optional[int] = None,
+        dedupe: bool = False
+    ) -> dict:
+        """
+        Record a job and start it in this worker.
+        
+        With dedupe, an organization has at most one queued or running job
+        of this type; submitting again returns the existing job.
+        """
+        if job_type not in self._handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+        job = {
+            "_id": ObjectId(),
+            "type": job_type,
+            "organization_id": organization_id,
+            "params": params or {},
+            "state": QUEUED,
+            "progress": {"done": 0, "total": total},
+            "result": None,
+            "error": None,
+            "attempts": 0,
+            "owner": None,
+            "created_at": datetime.utcnow(),
+            "started_at": None,
+            "heartbeat_at": None,
+            "finished_at": None
+        }
+        if dedupe:
+            job["active_key"] = f"{job_type}:{organization_id}"
+        try:
+            await self.jobs_collection.insert_one(job)
+        except DuplicateKeyError:
+            existing = await self.jobs_collection.find_one({"active_key": job["active_key"]})
+            if existing:
+                return existing
+            raise
+        self._start(job["_id"], job_type)
+        return job
+    
+    async def get_job(self, job_id: str) -> Optional[dict]:
+        """A job document by id, or None"""
+        if not ObjectId.is_valid(job_id):
+            return None
+        return await self.jobs_collection.find_one({"_id": ObjectId(job_id)})
+    
+    def _semaphore(self, job_type: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(job_type)
+        if semaphore is None:
+            semaphore = self._semaphores[job_type] = asyncio.Semaphore(self._limits[job_type])
+        return semaphore
+    
+    def _start(self, job_id: ObjectId, job_type: str):
+        if job_id in self._tasks or job_type not in self._handlers:
+            return
+        task = asyncio.create_task(self._run(job_id, job_type), name=f"{job_type}:{job_id}")
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+    
+    def _stale_cutoff(self) -> datetime:
+        return datetime.utcnow() - timedelta(seconds=settings.JOB_STALE_SECONDS)
+    
+    async def _claim(self, job_id: ObjectId) -> Optional[dict]:
+        """Take a queued or abandoned job for this worker; None if another worker has it"""
+        now = datetime.utcnow()
+        return await self.jobs_collection.find_one_and_update(
+            {
+                "_id": job_id,
+                "$or": [
+                    {"state": QUEUED},
+                    {"state": RUNNING, "heartbeat_at": {"$lt": self._stale_cutoff()}}
+                ]
+            },
+            {
+                "$set": {"state": RUNNING, "owner": self.owner, "started_at": now, "heartbeat_at": now},
+                "$inc": {"attempts": 1}
+            },
+            return_document=ReturnDocument.AFTER
+        )
+    
+    async def _update_owned(self, job_id: ObjectId, fields: dict, unset: Optional[dict] = None) -> bool:
+        """Update a job only while this worker still owns it"""
+        update = {"$set": fields}
+        if unset:
+            update["$unset"] = unset
+        result = await self.jobs_collection.update_one({"_id": job_id, "owner": self.owner}, update)
+        return result.matched_count > 0
+    
+    async def _finish(self, job_id: ObjectId, state: str, result: Optional[dict] = None, error: Optional[str] = None):
+        await self._update_owned(
+            job_id,
+            {"state": state, "result": result, "error": error, "finished_at": datetime.utcnow()},
+            unset={"active_key": ""}
+        )
+    
+    async def _run(self, job_id: ObjectId, job_type: str):
+        async with self._semaphore(job_type):
+            job = await self._claim(job_id)
+            if not job:
+                return
+            if job["attempts"] > settings.JOB_MAX_ATTEMPTS:
+                await self._finish(job_id, FAILED, error=f"Gave up after {settings.JOB_MAX_ATTEMPTS} attempts")
+                return
+            
+            progress = JobProgress(self, job_id, job["progress"].get("total"))
+            try:
+                result = await self._handlers[job_type](job, progress)
+            except Exception as e:
+                print(f"Job {job_id} ({job_type}) failed: {e}")
+                await self._finish(job_id, FAILED, error=str(e))
+                return
+            await progress.update(progress.done, force=True)
+            await self._finish(job_id, SUCCEEDED, result=result)
+    
+    async def resume(self) -> int:
+        """Start queued and abandoned jobs not already running here; returns how many"""
+        cutoff = self._stale_cutoff()
+        cursor = self.jobs_collection.find(
+            {
+                "type": {"$in": list(self._handlers)},
+                "$or": [
+                    {"state": QUEUED, "created_at": {"$lt": cutoff}},
+                    {"state": QUEUED, "owner": {"$ne": None}},
+                    {"state": RUNNING, "heartbeat_at": {"$lt": cutoff}}
+                ]
+            },
+            {"type": 1}
+        )
+        started = 0
+        async for job in cursor:
+            if job["_id"] not in self._tasks:
+                self._start(job["_id"], job["type"])
+                started += 1
+        return started
+    
+    async def _heartbeat(self):
+        """Refresh the heartbeat of the jobs this worker is running"""
+        if self._tasks:
+            await self.jobs_collection.update_many(
+                {"_id": {"$in": list(self._tasks)}, "state": RUNNING, "owner": self.owner},
+                {"$set": {"heartbeat_at": datetime.utcnow()}}
+            )
+    
+    async def purge_expired(self) -> int:
+        """Delete finished jobs (and export output) older than JOB_RETENTION_HOURS"""
+        cutoff = datetime.utcnow() - timedelta(hours=settings.JOB_RETENTION_HOURS)
+        expired = await self.jobs_collection.find(
+            {"finished_at": {"$lt": cutoff}}, {"type": 1}
+        ).to_list(None)
+        for job in expired:
+            if job["type"] == EXPORT_DOCUMENTS:
+                await delete_export(job["_id"])
+        if expired:
+            await self.jobs_collection.delete_many({"_id": {"$in": [job["_id"] for job in expired]}})
+        return len(expired)
+    
+    async def _run_sweeper(self, interval_seconds: float):
+        while True:
+            try:
+                await self._heartbeat()
+                resumed = await self.resume()
+                if resumed:
+                    print(f"Resumed {resumed} background jobs")
+                await self.purge_expired()
+            except Exception as e:
+                print(f"Job sweep failed: {e}")
+            await asyncio.sleep(interval_seconds)
+    
+    def start(self, interval_seconds: float):
+        """Begin heartbeats and the sweep for left-behind jobs (the first sweep runs now)"""
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._run_sweeper(interval_seconds))
+    
+    async def stop(self):
+        """Stop running jobs here and put them back in the queue for the next worker"""
+        if self._sweeper:
+            self._sweeper.cancel()
+            self._sweeper = None
+        job_ids = list(self._tasks)
+        for task in list(self._tasks.values()):
+            task.cancel()
+        if job_ids:
+            try:
+                await self.jobs_collection.update_many(
+                    {"_id": {"$in": job_ids}, "state": RUNNING, "owner": self.owner},
+                    {"$set": {"state": QUEUED}, "$inc": {"attempts": -1}}
+                )
+            except Exception as e:
+                print(f"Could not requeue background jobs: {e}")
+        self._tasks = {}
+    
+    def stats(self) -> dict:
+        """Jobs running or waiting in this worker, by type"""
+        counts = {job_type: 0 for job_type in self._handlers}
+        for task in self._tasks.values():
+            job_type = task.get_name().split(":", 1)[0]
+            if job_type in counts:
+                counts[job_type] += 1
+        return {"in_process": counts, "limits": dict(self._limits)}
+
+
+def export_bucket() -> AsyncGridFSBucket:
+    return AsyncGridFSBucket(db_connection.get_master_db(), bucket_name=EXPORT_BUCKET)
+
+
+async def delete_export(job_id: ObjectId):
+    """Remove an export job's output, if any"""
+    try:
+        await export_bucket().delete(job_id)
+    except NoFile:
+        pass
+
+
+async def read_export(job_id: ObjectId) -> Optional[AsyncIterator[bytes]]:
+    """An export job's NDJSON output as a stream of chunks, or None if there is none"""
+    try:
+        grid_out = await export_bucket().open_download_stream(job_id)
+    except NoFile:
+        return None
+    
+    async def chunks() -> AsyncIterator[bytes]:
+        while True:
+            chunk = await grid_out.readchunk()
+            if not chunk:
+                break
+            yield chunk
+    
+    return chunks()
+
+
+async def run_delete_organization(job: dict, progress: JobProgress) -> dict:
+    """Delete an organization, its admin and its tenant data (safe to re-run)"""
+    deleted = await organization_service.delete_organization(
+        job["organization_id"],
+        progress=progress.update
+    )
+    return {"organization_id": job["organization_id"], "deleted": deleted}
+
+
+async def run_export_documents(job: dict, progress: JobProgress) -> dict:
+    """Write matching tenant documents to GridFS as NDJSON (restarts from scratch)"""
+    chunks = await tenant_data_service.export_documents(
+        job["organization_id"],
+        filter=json.loads(job["params"]["filter"]),
+        projection=json.loads(job["params"]["projection"])
+    )
+    await delete_export(job["_id"])
+    upload = export_bucket().open_upload_stream_with_id(
+        job["_id"],
+        f"export-{job['_id']}.ndjson",
+        metadata={"organization_id": job["organization_id"], "content_type": "application/x-ndjson"}
+    )
+    exported = 0
+    try:
+        async for chunk in chunks:
+            await upload.write(chunk.encode())
+            exported += chunk.count("\n")
+            await progress.update(exported)
+    except BaseException:
+        await upload.abort()
+        raise
+    await upload.close()
+    return {"documents": exported, "bytes": upload.length}
+
+
+# Singleton instance
+job_runner = JobRunner()
+job_runner.register(DELETE_ORGANIZATION, run_delete_organization, settings.JOB_DELETE_CONCURRENCY)
+job_runner.register(EXPORT_DOCUMENTS, run_export_documents, settings.JOB_EXPORT_CONCURRENCY)
+
+# Each forked worker claims and heartbeats jobs under its own owner id
+os.register_at_fork(after_in_child=job_runner.reset_after_fork)
@@ -1,10 +1,74 @@
-from fastapi import FastAPI, Request, status
+import asyncio
+import math
+from fastapi import FastAPI, Request, Response, status
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.config import settings
 from app.database import db_connection
-from app.routes import organizations, admin
+from app.auth import auth_service, HashingPoolSaturatedError
+from app.services import organization_service, IndexBuildError
+from app.placement import placement_router, TenantMigratingError
+from app.rate_limit import RateLimitExceededError
+from app.monitoring import pool_metrics
+from app.health import health_monitor
+from app.jobs import job_runner
+from app.metrics import PrometheusMiddleware, monitor_event_loop_lag, render_metrics
+from app.routes import organizations, admin, tenant_data, jobs
+
+
+async def run_startup_tasks():
+    """
+    Connect, provision indexes and warm caches in the background.
+    
+    The server starts accepting requests immediately (the MongoDB client is
+    created lazily on first use); /ready reports 503 until these steps have
+    finished. They are retried with backoff while MongoDB is unreachable.
+    An index that existing data prevents (IndexBuildError) is not retried:
+    it is reported in /ready and the instance stays not ready.
+    Demo data is seeded last and does not gate readiness.
+    """
+    retry_delay = 1.0
+    while True:
+        try:
+            await db_connection.connect()
+            print("Database connection established")
+            health_monitor.complete_step("database")
+            
+            # Provision master collection indexes
+            await organization_service.ensure_indexes()
+            await job_runner.ensure_indexes()
+            print("Database indexes ensured")
+            health_monitor.complete_step("indexes")
+            
+            # Warm the organization metadata cache
+            warmed = await organization_service.warm_organization_cache(settings.ORG_CACHE_WARM_LIMIT)
+            print(f"Warmed organization cache with {warmed} organizations")
+            health_monitor.complete_step("organization_cache")
+            break
+            
+        except IndexBuildError as e:
+            # Existing data blocks the build; retrying would only hide it as a connection error
+            print(f"Database indexes could not be created: {e}")
+            print("Resolve the conflicting documents and restart; the instance stays not ready")
+            health_monitor.fail_step("indexes", str(e))
+            return
+        
+        except Exception as e:
+            print(f"Error connecting to database: {e} (retrying in {retry_delay:.0f}s)")
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, 30.0)
+    
+    # Refresh health now rather than waiting for the next heartbeat
+    await health_monitor.check_once(settings.HEALTH_CHECK_TIMEOUT_SECONDS)
+    
+    # Resume background jobs left queued or abandoned by earlier workers
+    job_runner.start(settings.JOB_HEARTBEAT_SECONDS)
+    
+    if settings.SEED_DEMO_DATA:
+        print("\nInitializing demo data...")
+        from app.seed_data import seed_demo_data
+        await seed_demo_data()
 
 
 @asynccontextmanager
@@ -12,23 +76,29 @@ async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
     print("Starting Organization Management Service...")
-    try:
-        db_connection.connect()
-        print("Database connection established")
-        
-        # Seed demo data on startup
-        print("\nInitializing demo data...")
-        from app.seed_data import seed_demo_data
-        seed_demo_data()
-        
-    except Exception as e:
-        print(f"Error connecting to database: {e}")
+    lag_monitor = None
+    if settings.METRICS_ENABLED:
+        lag_monitor = asyncio.create_task(monitor_event_loop_lag(settings.EVENT_LOOP_LAG_INTERVAL_SECONDS))
+    
+    for step in ("database", "indexes", "organization_cache"):
+        health_monitor.begin_step(step)
+    startup_tasks = asyncio.create_task(run_startup_tasks())
+    
+    # Keep database health in memory so /health never blocks on MongoDB
+    health_monitor.start(settings.HEALTH_CHECK_INTERVAL_SECONDS, settings.HEALTH_CHECK_TIMEOUT_SECONDS)
     
     yield
     
     # Shutdown
     print("Shutting down Organization Management Service...")
-    db_connection.close()
+    startup_tasks.cancel()
+    if lag_monitor:
+        lag_monitor.cancel()
+    health_monitor.stop()
+    await job_runner.stop()
+    await placement_router.close()
+    await db_connection.close()
+    auth_service.hashing_pool.shutdown()
 
 
 # Create FastAPI application
@@ -49,6 +119,42 @@ app.add_middleware(
 )
 
 
+# Password hashing saturation handler
+@app.exception_handler(HashingPoolSaturatedError)
+async def hashing_saturated_handler(request: Request, exc: HashingPoolSaturatedError):
+    """Shed load quickly when bcrypt capacity is exhausted"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"}
+    )
+
+
+@app.exception_handler(TenantMigratingError)
+async def tenant_migrating_handler(request: Request, exc: TenantMigratingError):
+    """Writes to a tenant pause while its data moves between clusters"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Organization data is being migrated, please retry shortly"},
+        headers={"Retry-After": str(int(settings.TENANT_PLACEMENT_CACHE_TTL_SECONDS) or 1)}
+    )
+
+
+@app.exception_handler(RateLimitExceededError)
+async def rate_limited_handler(request: Request, exc: RateLimitExceededError):
+    """Too many credential attempts from this client or for this account"""
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Too many attempts, please retry later"},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))}
+    )
+
+
+# Prometheus request metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(PrometheusMiddleware)
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -62,6 +168,8 @@ async def global_exception_handler(request: Request, exc: Exception):
 # Include routers
 app.include_router(organizations.router)
 app.include_router(admin.router)
+app.include_router(tenant_data.router)
+app.include_router(jobs.router)
 
 
 # Root endpoint
@@ -225,31 +333,44 @@ async def root():
 # Health check endpoint
 @app.get("/health", tags=["Health"])
 async def health_check():
-    """Health check endpoint"""
-    try:
-        # Check database connection
-        db_connection.get_master_db().command("ping")
-        db_status = "connected"
-    except Exception as e:
-        db_status = f"disconnected: {str(e)}"
-    
+    """Health check endpoint (served from the background heartbeat's cached state)"""
     return {
-        "status": "healthy" if db_status == "connected" else "unhealthy",
-        "database": db_status
+        **health_monitor.health(),
+        "password_hashing": auth_service.hashing_pool.stats(),
+        "organization_cache": organization_service.organization_cache.stats(),
+        "mongodb_pool": pool_metrics.stats(),
+        "background_jobs": job_runner.stats()
     }
 
 
+# Readiness endpoint
+@app.get("/ready", tags=["Health"])
+async def readiness_check():
+    """Readiness endpoint: 503 until startup work has finished and the database is reachable"""
+    readiness = health_monitor.readiness()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if readiness["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=readiness
+    )
+
+
+# Prometheus metrics endpoint
+@app.get("/metrics", tags=["Health"], include_in_schema=settings.METRICS_ENABLED)
+async def metrics():
+    """Prometheus metrics in the text exposition format"""
+    if not settings.METRICS_ENABLED:
+        return JSONResponse(status_code=status.HTTP_404_NOT_FOUND, content={"detail": "Not Found"})
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 # Demo/Sample Data endpoint
 @app.post("/demo/create-sample-data", tags=["Demo"])
 async def create_sample_data():
     """Create sample organization and admin data for demonstration"""
-    from app.services import OrganizationService
-    
     try:
-        org_service = OrganizationService()
-        
         # Check if sample org already exists
-        if org_service.organization_exists("Demo Company"):
+        if await organization_service.organization_exists("Demo Company"):
             return {
                 "message": "Sample data already exists",
                 "organization_name": "Demo Company",
@@ -259,7 +380,7 @@ async def create_sample_data():
             }
         
         # Create sample organization
-        org = org_service.create_organization(
+        org = await organization_service.create_organization(
             organization_name="Demo Company",
             email="admin@democompany.com",
             password="Demo@123456"
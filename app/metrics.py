@@ -0,0 +1,139 @@
+import asyncio
+import os
+import time
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, Gauge, generate_latest
+from prometheus_client import multiprocess
+from prometheus_client.core import GaugeMetricFamily
+
+
+# HTTP request series, labelled by route template (not raw path) to bound cardinality
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests handled",
+    ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "route", "status"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+# MongoDB command latency, fed by CommandMetricsListener
+MONGODB_COMMAND_DURATION = Histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command latency",
+    ["command", "collection", "outcome"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+)
+
+# bcrypt work done by AuthService
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "bcrypt hash/verify duration",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0)
+)
+
+# Credential checks refused by the rate limiter, by bucket scope (ip / email)
+RATE_LIMITED = Counter(
+    "rate_limited_requests_total",
+    "Requests rejected by the rate limiter",
+    ["scope"]
+)
+
+# How late the event loop wakes up compared with when it was asked to
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Event loop scheduling lag",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+)
+EVENT_LOOP_LAG_LAST = Gauge(
+    "event_loop_lag_last_seconds",
+    "Most recent event loop lag sample",
+    multiprocess_mode="liveall"
+)
+
+
+class PrometheusMiddleware:
+    """ASGI middleware recording request count and latency by route and status"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.perf_counter()
+        status_code = 500
+        
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            labels = (scope["method"], route_path, str(status_code))
+            HTTP_REQUESTS.labels(*labels).inc()
+            HTTP_REQUEST_DURATION.labels(*labels).observe(time.perf_counter() - start)
+
+
+class AppStatsCollector:
+    """Expose the in-process pool and cache counters as gauges at scrape time"""
+    
+    def describe(self):
+        # Nothing to pre-declare; avoids collect() running at registration time
+        return []
+    
+    def collect(self):
+        from app.auth import auth_service
+        from app.monitoring import pool_metrics
+        from app.services import organization_service
+        
+        sources = {
+            "password_hashing": auth_service.hashing_pool.stats(),
+            "organization_cache": organization_service.organization_cache.stats(),
+            "token_cache": auth_service.token_cache.stats(),
+            "mongodb_pool": pool_metrics.stats(),
+        }
+        for prefix, stats in sources.items():
+            for key, value in stats.items():
+                if isinstance(value, (int, float)):
+                    yield GaugeMetricFamily(f"app_{prefix}_{key}", f"{prefix} {key}", value=float(value))
+
+
+REGISTRY.register(AppStatsCollector())
+
+
+async def monitor_event_loop_lag(interval_seconds: float):
+    """Sample event loop lag forever (run as a background task)"""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval_seconds)
+        lag = max(0.0, loop.time() - start - interval_seconds)
+        EVENT_LOOP_LAG.observe(lag)
+        EVENT_LOOP_LAG_LAST.set(lag)
+
+
+def render_metrics() -> tuple:
+    """
+    Render all series in the Prometheus text format.
+    
+    With several workers (PROMETHEUS_MULTIPROC_DIR set, see gunicorn.conf.py)
+    counters and histograms are aggregated across workers; the pool and cache
+    gauges describe the worker that answered the scrape.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(AppStatsCollector())
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
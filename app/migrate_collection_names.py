@@ -0,0 +1,136 @@
+"""
+One-time migration of tenant collections to id-keyed names
+
+Organizations created before collection names were keyed by organization
+id have their own collection named org_<sanitized name>. This moves each of
+them to org_<organization id> (a server-side renameCollection on the
+cluster holding the tenant) and updates collection_name in the master
+database. Shared-mode organizations and already migrated ones are skipped,
+so the command can be run again after an interruption.
+
+While a batch is moved its tenants are marked migrating in the placement
+map, so every worker refuses writes to them (503 with Retry-After) until
+the rename is done and cached organization metadata has expired. Reads in
+that window may come back empty on workers still holding the old name.
+Use --offline when no server is running to skip those waits.
+
+Usage:
+    python -m app.migrate_collection_names [--dry-run] [--offline] [--batch-size 100]
+"""
+import asyncio
+from typing import List
+from app.config import settings
+from app.database import db_connection
+from app.placement import placement_router, PRIMARY_CLUSTER, MIGRATING
+from app.services import organization_service
+from app.tenant_storage import SHARED_MODE
+
+
+async def find_legacy_organizations() -> List[dict]:
+    """Organizations whose own collection is not yet named after their id"""
+    cursor = organization_service.organizations_collection.find(
+        {"storage_mode": {"$ne": SHARED_MODE}},
+        {"organization_name": 1, "collection_name": 1},
+        sort=[("_id", 1)]
+    )
+    return [
+        org_doc async for org_doc in cursor
+        if org_doc["collection_name"] != organization_service._generate_collection_name(org_doc["_id"])
+    ]
+
+
+async def migrate_batch(org_docs: List[dict], wait: bool = True) -> dict:
+    """Rename one batch of tenant collections; returns counts by outcome"""
+    counts = {"migrated": 0, "skipped": 0, "failed": 0}
+    
+    # Pause writes to the whole batch at once so the waits are paid per batch
+    clusters = {}
+    for org_doc in org_docs:
+        placement_router.placement_cache.delete(str(org_doc["_id"]))
+        placement = await placement_router.get_placement(org_doc["_id"])
+        if placement["state"] == MIGRATING:
+            # Being moved between clusters; run again once that has finished
+            print(f"  skipped {org_doc['organization_name']}: cluster migration in progress")
+            counts["skipped"] += 1
+            continue
+        await placement_router.assign(org_doc["_id"], placement["cluster"], state=MIGRATING)
+        clusters[org_doc["_id"]] = placement["cluster"]
+    
+    try:
+        if wait:
+            await asyncio.sleep(placement_router.placement_cache.ttl_seconds)
+        
+        for org_doc in org_docs:
+            if org_doc["_id"] not in clusters:
+                continue
+            old_name = org_doc["collection_name"]
+            new_name = organization_service._generate_collection_name(org_doc["_id"])
+            try:
+                tenant_db = placement_router.get_database(clusters[org_doc["_id"]])
+                # Progress is only reported when the server refuses the rename and the data is copied
+                await db_connection.rename_collection(
+                    old_name, new_name, tenant_db,
+                    progress=lambda copied, total, name=old_name: print(f"  {name}: {copied}/{total} documents copied")
+                )
+                await organization_service.organizations_collection.update_one(
+                    {"_id": org_doc["_id"], "collection_name": old_name},
+                    {"$set": {"collection_name": new_name}}
+                )
+                organization_service._invalidate_organization(
+                    org_doc["organization_name"], organization_id=str(org_doc["_id"])
+                )
+                counts["migrated"] += 1
+            except Exception as e:
+                print(f"  failed {org_doc['organization_name']}: {e}")
+                counts["failed"] += 1
+        
+        if wait:
+            # Let every worker's cached metadata pick up the new names before writes resume
+            await asyncio.sleep(settings.ORG_CACHE_TTL_SECONDS)
+    finally:
+        for organization_id, cluster in clusters.items():
+            if cluster == PRIMARY_CLUSTER:
+                await placement_router.remove(organization_id)
+            else:
+                await placement_router.assign(organization_id, cluster)
+    
+    return counts
+
+
+async def migrate_collection_names(batch_size: int = 100, wait: bool = True, dry_run: bool = False) -> dict:
+    """Move every legacy org_<name> collection to org_<organization id>"""
+    org_docs = await find_legacy_organizations()
+    totals = {"pending": len(org_docs), "migrated": 0, "skipped": 0, "failed": 0}
+    if dry_run:
+        for org_doc in org_docs:
+            print(f"  {org_doc['organization_name']}: {org_doc['collection_name']} -> "
+                  f"{organization_service._generate_collection_name(org_doc['_id'])}")
+        return totals
+    
+    for start in range(0, len(org_docs), batch_size):
+        counts = await migrate_batch(org_docs[start:start + batch_size], wait=wait)
+        for outcome, count in counts.items():
+            totals[outcome] += count
+        print(f"  {min(start + batch_size, len(org_docs))}/{len(org_docs)} organizations processed")
+    return totals
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="List the collections that would be renamed")
+    parser.add_argument("--offline", action="store_true", help="Skip the write pauses (no server running)")
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+    
+    async def main():
+        try:
+            totals = await migrate_collection_names(args.batch_size, wait=not args.offline, dry_run=args.dry_run)
+            print(f"{totals['pending']} legacy collections: {totals['migrated']} migrated, "
+                  f"{totals['skipped']} skipped, {totals['failed']} failed")
+        finally:
+            await placement_router.close()
+            await db_connection.close()
+    
+    asyncio.run(main())
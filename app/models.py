@@ -13,7 +13,8 @@ class Organization:
         admin_email: str,
         created_at: Optional[datetime] = None,
         updated_at: Optional[datetime] = None,
-        organization_id: Optional[str] = None
+        organization_id: Optional[str] = None,
+        storage_mode: str = "collection"
     ):
         self.organization_name = organization_name
         self.collection_name = collection_name
@@ -22,12 +23,14 @@ class Organization:
         self.created_at = created_at or datetime.utcnow()
         self.updated_at = updated_at
         self.organization_id = organization_id
+        self.storage_mode = storage_mode
     
     def to_dict(self) -> dict:
         """Convert organization to dictionary"""
         return {
             "organization_name": self.organization_name,
             "collection_name": self.collection_name,
+            "storage_mode": self.storage_mode,
             "admin_id": self.admin_id,
             "admin_email": self.admin_email,
             "created_at": self.created_at,
@@ -43,7 +46,9 @@ class Organization:
             admin_id=data.get("admin_id"),
             admin_email=data.get("admin_email"),
             created_at=data.get("created_at"),
-            updated_at=data.get("updated_at")
+            updated_at=data.get("updated_at"),
+            # Organizations created before storage modes existed have their own collection
+            storage_mode=data.get("storage_mode", "collection")
         )
         org.organization_id = str(data.get("_id", ""))
         return org
@@ -58,13 +63,16 @@ class Admin:
         hashed_password: str,
         organization_id: str,
         created_at: Optional[datetime] = None,
-        admin_id: Optional[str] = None
+        admin_id: Optional[str] = None,
+        organization_name: Optional[str] = None
     ):
         self.email = email
         self.hashed_password = hashed_password
         self.organization_id = organization_id
         self.created_at = created_at or datetime.utcnow()
         self.admin_id = admin_id
+        # Copy of the organization's name so login needs no organization lookup
+        self.organization_name = organization_name
     
     def to_dict(self) -> dict:
         """Convert admin to dictionary"""
@@ -72,6 +80,7 @@ class Admin:
             "email": self.email,
             "hashed_password": self.hashed_password,
             "organization_id": self.organization_id,
+            "organization_name": self.organization_name,
             "created_at": self.created_at
         }
     
@@ -82,7 +91,8 @@ class Admin:
             email=data.get("email"),
             hashed_password=data.get("hashed_password"),
             organization_id=data.get("organization_id"),
-            created_at=data.get("created_at")
+            created_at=data.get("created_at"),
+            organization_name=data.get("organization_name")
         )
         admin.admin_id = str(data.get("_id", ""))
         return admin
@@ -0,0 +1,106 @@
+from pymongo import monitoring
+from app.metrics import MONGODB_COMMAND_DURATION
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Connection pool listener that keeps running counters for sizing pools"""
+    
+    def __init__(self):
+        self.open_connections = 0
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.pool_clears = 0
+    
+    def pool_created(self, event):
+        pass
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        self.pool_clears += 1
+    
+    def pool_closed(self, event):
+        pass
+    
+    def connection_created(self, event):
+        self.open_connections += 1
+    
+    def connection_ready(self, event):
+        pass
+    
+    def connection_closed(self, event):
+        self.open_connections = max(0, self.open_connections - 1)
+    
+    def connection_check_out_started(self, event):
+        pass
+    
+    def connection_check_out_failed(self, event):
+        self.checkout_failures += 1
+        self._record_wait(event.duration)
+    
+    def connection_checked_out(self, event):
+        self.checkouts += 1
+        self.checked_out += 1
+        self.max_checked_out = max(self.max_checked_out, self.checked_out)
+        self._record_wait(event.duration)
+    
+    def connection_checked_in(self, event):
+        self.checked_out = max(0, self.checked_out - 1)
+    
+    def _record_wait(self, duration: float):
+        self.total_wait_seconds += duration
+        self.max_wait_seconds = max(self.max_wait_seconds, duration)
+    
+    def stats(self) -> dict:
+        """Snapshot of pool occupancy, checkout wait time and clear events"""
+        attempts = (self.checkouts + self.checkout_failures) or 1
+        return {
+            "open_connections": self.open_connections,
+            "checked_out": self.checked_out,
+            "max_checked_out": self.max_checked_out,
+            "checkouts": self.checkouts,
+            "checkout_failures": self.checkout_failures,
+            "avg_wait_ms": round(self.total_wait_seconds / attempts * 1000, 3),
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            "pool_clears": self.pool_clears,
+        }
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Command listener that records MongoDB command latency by command and collection"""
+    
+    def __init__(self):
+        # Collection label per in-flight command, keyed by (connection, request id)
+        self._in_flight = {}
+    
+    def _collection_label(self, event) -> str:
+        target = event.command.get(event.command_name)
+        if not isinstance(target, str):
+            return ""
+        # One label for all tenant collections keeps series cardinality bounded
+        return "org_*" if target.startswith("org_") else target
+    
+    def started(self, event):
+        self._in_flight[(event.connection_id, event.request_id)] = self._collection_label(event)
+    
+    def succeeded(self, event):
+        self._observe(event, "success")
+    
+    def failed(self, event):
+        self._observe(event, "failure")
+    
+    def _observe(self, event, outcome: str):
+        collection = self._in_flight.pop((event.connection_id, event.request_id), "")
+        MONGODB_COMMAND_DURATION.labels(event.command_name, collection, outcome).observe(
+            event.duration_micros / 1_000_000
+        )
+
+
+# Singleton instances
+pool_metrics = PoolMetricsListener()
+command_metrics = CommandMetricsListener()
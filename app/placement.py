@@ -0,0 +1,237 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Union
+from bson import ObjectId
+from pymongo import AsyncMongoClient
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
+from app.cache import LRUTTLCache
+from app.config import settings
+from app.database import db_connection
+from app.models import Organization
+from app.tenant_storage import SHARED_MODE, delete_shared_documents, get_shared_collection, tenant_query
+
+
+# The cluster behind MONGODB_URL / MASTER_DB_NAME; tenants without a placement entry live here
+PRIMARY_CLUSTER = "primary"
+
+# Placement states
+ACTIVE = "active"
+MIGRATING = "migrating"
+
+
+class UnknownClusterError(ValueError):
+    """Raised when a cluster name is not configured in TENANT_CLUSTERS"""
+    pass
+
+
+class TenantMigratingError(Exception):
+    """Raised when writing to a tenant whose data is being moved between clusters"""
+    pass
+
+
+class TenantPlacementRouter:
+    """
+    Maps organizations to the cluster that holds their tenant collection.
+    
+    The map lives in the master database (tenant_placements, keyed by
+    organization id); tenants without an entry are on the primary cluster.
+    Each configured cluster gets its own lazily created client and
+    connection pool, and resolved placements are cached for
+    TENANT_PLACEMENT_CACHE_TTL_SECONDS.
+    """
+    
+    def __init__(self):
+        self._clients: Dict[str, AsyncMongoClient] = {}
+        self.placement_cache = LRUTTLCache(
+            max_size=settings.ORG_CACHE_SIZE,
+            ttl_seconds=settings.TENANT_PLACEMENT_CACHE_TTL_SECONDS
+        )
+    
+    @property
+    def placements_collection(self) -> AsyncCollection:
+        return db_connection.get_collection("tenant_placements")
+    
+    def cluster_names(self) -> List[str]:
+        """All clusters tenants can be placed on"""
+        return [PRIMARY_CLUSTER, *settings.TENANT_CLUSTERS]
+    
+    def get_database(self, cluster: str) -> AsyncDatabase:
+        """Tenant database on a cluster (the database named in its URL, else MASTER_DB_NAME)"""
+        if cluster == PRIMARY_CLUSTER:
+            return db_connection.get_master_db()
+        url = settings.TENANT_CLUSTERS.get(cluster)
+        if url is None:
+            raise UnknownClusterError(f"Unknown cluster: {cluster}")
+        client = self._clients.get(cluster)
+        if client is None:
+            client = db_connection.create_client(url)
+            self._clients[cluster] = client
+        return client.get_default_database(default=settings.MASTER_DB_NAME)
+    
+    async def get_placement(self, organization_id: Union[str, ObjectId]) -> dict:
+        """Cluster and state for an organization, from the cache or the placement map"""
+        key = str(organization_id)
+        placement = self.placement_cache.get(key)
+        if placement is None:
+            doc = await self.placements_collection.find_one({"_id": ObjectId(key)})
+            placement = {
+                "cluster": doc["cluster"] if doc else PRIMARY_CLUSTER,
+                "state": doc.get("state", ACTIVE) if doc else ACTIVE
+            }
+            self.placement_cache.set(key, placement)
+        return placement
+    
+    async def get_tenant_database(self, organization_id: Union[str, ObjectId], for_write: bool = False) -> AsyncDatabase:
+        """Database holding an organization's collection; writes are refused while it migrates"""
+        placement = await self.get_placement(organization_id)
+        if for_write and placement["state"] == MIGRATING:
+            raise TenantMigratingError(str(organization_id))
+        return self.get_database(placement["cluster"])
+    
+    async def assign(self, organization_id: Union[str, ObjectId], cluster: str, state: str = ACTIVE):
+        """Record an organization's cluster in the placement map"""
+        self.get_database(cluster)
+        await self.placements_collection.update_one(
+            {"_id": ObjectId(str(organization_id))},
+            {"$set": {"cluster": cluster, "state": state, "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+        self.placement_cache.delete(str(organization_id))
+    
+    async def remove(self, organization_id: Union[str, ObjectId]):
+        """Delete an organization's placement entry"""
+        await self.placements_collection.delete_one({"_id": ObjectId(str(organization_id))})
+        self.placement_cache.delete(str(organization_id))
+    
+    async def place_new_tenant(self, organization_id: ObjectId) -> AsyncDatabase:
+        """Place a new organization on TENANT_DEFAULT_CLUSTER and return its database"""
+        cluster = settings.TENANT_DEFAULT_CLUSTER
+        if cluster != PRIMARY_CLUSTER:
+            await self.assign(organization_id, cluster)
+        return self.get_database(cluster)
+    
+    async def place_new_tenants(self, organization_ids: List[ObjectId]) -> AsyncDatabase:
+        """Bulk variant of place_new_tenant, one write for all entries"""
+        cluster = settings.TENANT_DEFAULT_CLUSTER
+        database = self.get_database(cluster)
+        if cluster != PRIMARY_CLUSTER and organization_ids:
+            now = datetime.utcnow()
+            await self.placements_collection.insert_many(
+                [{"_id": organization_id, "cluster": cluster, "state": ACTIVE, "updated_at": now}
+                 for organization_id in organization_ids],
+                ordered=False
+            )
+        return database
+    
+    async def migrate_tenant(
+        self,
+        organization: Organization,
+        target_cluster: str,
+        progress: Optional[Callable[[int, int], None]] = None
+    ) -> dict:
+        """
+        Move an organization's documents to another cluster.
+        
+        The placement is marked migrating, then we wait one placement cache
+        TTL so every worker refuses writes before the copy starts. The copy
+        is the resumable _id-ordered stream used for renames, so an
+        interrupted migration is finished by running it again. Once copied,
+        the placement is switched to the target and, after another cache TTL
+        so no worker still reads from the source, the source is dropped (for
+        shared-mode tenants, only their documents are copied and removed).
+        """
+        organization_id = organization.organization_id
+        collection_name = organization.collection_name
+        query = tenant_query(organization.storage_mode, organization_id)
+        self.placement_cache.delete(str(organization_id))
+        placement = await self.get_placement(organization_id)
+        source_cluster = placement["cluster"]
+        target_db = self.get_database(target_cluster)
+        if source_cluster == target_cluster:
+            # Nothing to move; also releases a migration abandoned part way
+            if placement["state"] != ACTIVE:
+                await self.assign(organization_id, source_cluster)
+            return {"source": source_cluster, "target": target_cluster, "copied": 0, "status": "unchanged"}
+        source_db = self.get_database(source_cluster)
+        
+        await self.assign(organization_id, source_cluster, state=MIGRATING)
+        await asyncio.sleep(self.placement_cache.ttl_seconds)
+        
+        try:
+            if organization.storage_mode == SHARED_MODE:
+                # Create the tenant index on the target before copying into it
+                await get_shared_collection(target_db)
+            copied = await db_connection.copy_collection(
+                collection_name, collection_name, source_db,
+                target_database=target_db, progress=progress, query=query
+            )
+        except Exception:
+            await self.assign(organization_id, source_cluster)
+            raise
+        
+        await self.assign(organization_id, target_cluster)
+        # Workers still caching the source placement read from it until their entry expires
+        await asyncio.sleep(self.placement_cache.ttl_seconds)
+        if organization.storage_mode == SHARED_MODE:
+            # The source collection holds other tenants too; remove only this one's documents
+            await delete_shared_documents(source_db, organization_id)
+        else:
+            await db_connection.drop_collection(collection_name, source_db)
+        return {"source": source_cluster, "target": target_cluster, "copied": copied, "status": "migrated"}
+    
+    def reset_after_fork(self):
+        """Forget cluster clients inherited from the parent process"""
+        self._clients = {}
+        self.placement_cache.clear()
+    
+    async def close(self):
+        """Close all cluster clients"""
+        for client in self._clients.values():
+            await client.close()
+        self._clients = {}
+
+
+# Singleton instance
+placement_router = TenantPlacementRouter()
+
+# Each forked worker gets its own cluster clients
+os.register_at_fork(after_in_child=placement_router.reset_after_fork)
+
+
+if __name__ == "__main__":
+    import argparse
+    from app.services import organization_service
+    
+    parser = argparse.ArgumentParser(description="Tenant placement commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+    show = commands.add_parser("show", help="Show where an organization's data lives")
+    show.add_argument("organization_name")
+    migrate = commands.add_parser("migrate", help="Move an organization's data to another cluster")
+    migrate.add_argument("organization_name")
+    migrate.add_argument("cluster", help=f"Target cluster: {PRIMARY_CLUSTER} or a TENANT_CLUSTERS name")
+    args = parser.parse_args()
+    
+    async def main():
+        organization = await organization_service.get_organization_by_name(args.organization_name)
+        if not organization:
+            raise SystemExit(f"Organization '{args.organization_name}' not found")
+        try:
+            if args.command == "show":
+                placement = await placement_router.get_placement(organization.organization_id)
+                print(f"{organization.organization_name}: {organization.collection_name} on "
+                      f"{placement['cluster']} ({placement['state']})")
+            else:
+                result = await placement_router.migrate_tenant(
+                    organization,
+                    args.cluster,
+                    progress=lambda copied, total: print(f"  {copied}/{total} documents copied")
+                )
+                print(f"{organization.organization_name}: {result['source']} -> {result['target']} "
+                      f"({result['status']}, {result['copied']} documents)")
+        finally:
+            await placement_router.close()
+            await db_connection.close()
+    
+    asyncio.run(main())
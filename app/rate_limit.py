@@ -0,0 +1,163 @@
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from fastapi import Request
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.config import settings
+from app.database import db_connection
+from app.metrics import RATE_LIMITED
+
+
+class RateLimitExceededError(Exception):
+    """Raised when a token bucket is empty; retry_after is in seconds"""
+    
+    def __init__(self, scope: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded for {scope}")
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+class RateLimitBackend:
+    """
+    Token bucket storage.
+    
+    consume() takes cost tokens from the bucket at key (refilled at
+    refill_per_second up to capacity) and returns 0 if they were available,
+    otherwise the seconds until they will be. Implement this to share
+    limiter state through another store.
+    """
+    
+    async def consume(self, key: str, capacity: float, refill_per_second: float, cost: float = 1.0) -> float:
+        raise NotImplementedError
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Buckets held in this process; each worker limits independently"""
+    
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        # key -> (tokens, monotonic time of the last update)
+        self._buckets: OrderedDict = OrderedDict()
+    
+    async def consume(self, key: str, capacity: float, refill_per_second: float, cost: float = 1.0) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+        wait = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            wait = (cost - tokens) / refill_per_second
+        self._buckets[key] = (tokens, now)
+        # Least recently used buckets go first; a dropped bucket starts full again
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class MongoRateLimitBackend(RateLimitBackend):
+    """
+    Buckets in the master database's rate_limits collection, shared by all
+    workers and instances. Each consume is one atomic find_one_and_update
+    with a pipeline that refills, checks and debits the bucket; idle
+    buckets are removed by a TTL index once they would be full again.
+    """
+    
+    def __init__(self):
+        self._indexed = False
+    
+    async def consume(self, key: str, capacity: float, refill_per_second: float, cost: float = 1.0) -> float:
+        collection = db_connection.get_collection("rate_limits")
+        if not self._indexed:
+            await collection.create_index("expires_at", expireAfterSeconds=0, name="expires_at_ttl")
+            self._indexed = True
+        
+        now = datetime.utcnow()
+        elapsed_seconds = {"$divide": [{"$subtract": [now, {"$ifNull": ["$updated_at", now]}]}, 1000]}
+        refilled = {"$min": [
+            capacity,
+            {"$add": [{"$ifNull": ["$tokens", capacity]}, {"$multiply": [elapsed_seconds, refill_per_second]}]}
+        ]}
+        pipeline = [
+            {"$set": {"tokens": refilled, "updated_at": now}},
+            {"$set": {"allowed": {"$gte": ["$tokens", cost]}}},
+            {"$set": {
+                "tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", cost]}, "$tokens"]},
+                "expires_at": now + timedelta(seconds=capacity / refill_per_second)
+            }}
+        ]
+        
+        for attempt in range(2):
+            try:
+                bucket = await collection.find_one_and_update(
+                    {"_id": key}, pipeline, upsert=True, return_document=ReturnDocument.AFTER
+                )
+                break
+            except DuplicateKeyError:
+                # Two workers created the bucket at once; the retry updates it
+                if attempt:
+                    raise
+        return 0.0 if bucket["allowed"] else (cost - bucket["tokens"]) / refill_per_second
+
+
+class RateLimiter:
+    """Token-bucket admission control for credential checks"""
+    
+    def __init__(self, backend: RateLimitBackend):
+        self.backend = backend
+    
+    async def hit(self, scope: str, identifier: str, burst: int, per_minute: float):
+        """Take one token from the scope's bucket for identifier, or raise RateLimitExceededError"""
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        wait = await self.backend.consume(f"{scope}:{identifier}", burst, per_minute / 60)
+        if wait > 0:
+            RATE_LIMITED.labels(scope).inc()
+            raise RateLimitExceededError(scope, wait)
+    
+    async def check_credentials(self, client_ip: str, email: str):
+        """
+        Admit a password check for this client and account.
+        
+        Runs before any bcrypt work, so a credential-stuffing burst is turned
+        away cheaply instead of occupying the hashing pool.
+        """
+        await self.hit("ip", client_ip, settings.LOGIN_RATE_LIMIT_IP_BURST, settings.LOGIN_RATE_LIMIT_IP_PER_MINUTE)
+        await self.hit(
+            "email", email.lower(), settings.LOGIN_RATE_LIMIT_EMAIL_BURST, settings.LOGIN_RATE_LIMIT_EMAIL_PER_MINUTE
+        )
+
+
+def client_ip(request: Request) -> str:
+    """
+    Address of the caller.
+    
+    Behind trusted proxies this is the X-Forwarded-For entry
+    RATE_LIMIT_TRUSTED_PROXY_HOPS from the right. Proxies append the peer
+    they saw, so entries further left come from the client and can be forged;
+    a header with fewer entries than hops falls back to the peer address.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+        forwarded = [
+            hop.strip()
+            for header in request.headers.getlist("x-forwarded-for")
+            for hop in header.split(",")
+            if hop.strip()
+        ]
+        hops = max(1, settings.RATE_LIMIT_TRUSTED_PROXY_HOPS)
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return peer
+
+
+def create_backend() -> RateLimitBackend:
+    """Backend selected by RATE_LIMIT_BACKEND"""
+    if settings.RATE_LIMIT_BACKEND == "mongodb":
+        return MongoRateLimitBackend()
+    return InMemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS)
+
+
+# Singleton instance
+rate_limiter = RateLimiter(create_backend())
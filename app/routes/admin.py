@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
 from datetime import timedelta
 from app.schemas import AdminLoginRequest, AdminLoginResponse
 from app.services import organization_service
 from app.auth import auth_service
+from app.rate_limit import rate_limiter, client_ip
 from app.config import settings
 
 
@@ -10,17 +11,21 @@ router = APIRouter(prefix="/admin", tags=["Admin"])
 
 
 @router.post("/login", response_model=AdminLoginResponse)
-async def admin_login(request: AdminLoginRequest):
+async def admin_login(request: AdminLoginRequest, http_request: Request):
     """
     Authenticate an admin user and return a JWT token.
     
+    - Rate limited per client IP and per email (429 when exceeded)
     - Validates admin credentials
     - Returns JWT token containing admin ID and organization ID
     - Token can be used for authenticated endpoints
     """
     
+    # Refuse excess attempts before any bcrypt work
+    await rate_limiter.check_credentials(client_ip(http_request), request.email)
+    
     # Authenticate admin
-    admin = organization_service.authenticate_admin(request.email, request.password)
+    admin = await organization_service.authenticate_admin(request.email, request.password)
     
     if not admin:
         raise HTTPException(
@@ -29,10 +34,8 @@ async def admin_login(request: AdminLoginRequest):
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Get organization details
-    organization = organization_service.get_organization_by_id(admin.organization_id)
-    
-    if not organization:
+    # The organization name comes with the admin document (no second lookup)
+    if not admin.organization_name:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Organization not found"
@@ -53,6 +56,6 @@ async def admin_login(request: AdminLoginRequest):
         access_token=access_token,
         token_type="bearer",
         admin_id=admin.admin_id,
-        organization_id=organization.organization_id,
-        organization_name=organization.organization_name
+        organization_id=admin.organization_id,
+        organization_name=admin.organization_name
     )
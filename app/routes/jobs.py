@@ -0,0 +1,81 @@
+from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.responses import StreamingResponse
+from app.schemas import JobResponse, TokenData
+from app.jobs import job_runner, read_export, EXPORT_DOCUMENTS, SUCCEEDED
+from app.dependencies import get_current_admin
+
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+def job_response(job: dict) -> JobResponse:
+    """Build the API view of a job document"""
+    return JobResponse(
+        job_id=str(job["_id"]),
+        type=job["type"],
+        state=job["state"],
+        organization_id=job["organization_id"],
+        progress=job["progress"],
+        result=job.get("result"),
+        error=job.get("error"),
+        attempts=job.get("attempts", 0),
+        created_at=job["created_at"],
+        started_at=job.get("started_at"),
+        finished_at=job.get("finished_at")
+    )
+
+
+async def _get_own_job(job_id: str, current_admin: TokenData) -> dict:
+    """A job of the admin's organization; other organizations' jobs are reported as missing"""
+    job = await job_runner.get_job(job_id)
+    if not job or job["organization_id"] != current_admin.organization_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job '{job_id}' not found"
+        )
+    return job
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str, current_admin: TokenData = Depends(get_current_admin)):
+    """
+    Get the state and progress of a background job.
+    
+    - Requires authentication; only jobs of the admin's organization are visible
+    - state is queued, running, succeeded or failed
+    - progress.total is null while it is not known
+    """
+    return job_response(await _get_own_job(job_id, current_admin))
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str, current_admin: TokenData = Depends(get_current_admin)):
+    """
+    Download the output of a finished export job as newline-delimited JSON.
+    
+    - 409 while the job has not succeeded
+    - Streamed from the master database; kept for JOB_RETENTION_HOURS
+    """
+    job = await _get_own_job(job_id, current_admin)
+    if job["type"] != EXPORT_DOCUMENTS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="This job has no downloadable result"
+        )
+    if job["state"] != SUCCEEDED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job is {job['state']}"
+        )
+    
+    chunks = await read_export(job["_id"])
+    if chunks is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export file has expired"
+        )
+    return StreamingResponse(
+        chunks,
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="export-{job_id}.ndjson"'}
+    )
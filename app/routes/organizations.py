@@ -1,14 +1,30 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Request, Response, status, Depends, Query
 from app.schemas import (
     OrganizationCreate,
+    OrganizationBulkCreate,
+    OrganizationBulkCreateResponse,
     OrganizationResponse,
     OrganizationGet,
+    OrganizationListResponse,
     OrganizationUpdate,
-    OrganizationDelete
+    OrganizationDelete,
+    JobResponse
 )
-from app.services import organization_service
+from app.services import (
+    organization_service,
+    ORGANIZATION_LIST_FIELDS,
+    OrganizationAlreadyExistsError,
+    AdminEmailAlreadyExistsError
+)
+from app.auth import HashingPoolSaturatedError
+from app.placement import placement_router
+from app.jobs import job_runner, DELETE_ORGANIZATION
+from app.routes.jobs import job_response
+from app.rate_limit import rate_limiter, client_ip
 from app.dependencies import get_current_admin
 from app.schemas import TokenData
+from app.config import settings
 
 
 router = APIRouter(prefix="/org", tags=["Organizations"])
@@ -20,31 +36,18 @@ async def create_organization(request: OrganizationCreate):
     Create a new organization with an admin user.
     
     - Validates that the organization name does not already exist
-    - Creates a dynamic MongoDB collection for the organization
+    - Creates a dynamic MongoDB collection for the organization (or uses the shared one)
     - Creates an admin user for the organization
     - Stores metadata in the Master Database
     """
     
-    # Check if organization already exists
-    if organization_service.organization_exists(request.organization_name):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Organization with name '{request.organization_name}' already exists"
-        )
-    
-    # Check if email already exists
-    if organization_service.email_exists(request.email):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Admin with email '{request.email}' already exists"
-        )
-    
     try:
         # Create organization
-        organization = organization_service.create_organization(
+        organization = await organization_service.create_organization(
             organization_name=request.organization_name,
             email=request.email,
-            password=request.password
+            password=request.password,
+            storage_mode=request.storage_mode
         )
         
         # Return response
@@ -52,11 +55,24 @@ async def create_organization(request: OrganizationCreate):
             organization_id=organization.organization_id,
             organization_name=organization.organization_name,
             collection_name=organization.collection_name,
+            storage_mode=organization.storage_mode,
             admin_email=organization.admin_email,
             created_at=organization.created_at,
             updated_at=organization.updated_at
         )
     
+    except OrganizationAlreadyExistsError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Organization with name '{request.organization_name}' already exists"
+        )
+    except AdminEmailAlreadyExistsError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Admin with email '{request.email}' already exists"
+        )
+    except HashingPoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -64,6 +80,34 @@ async def create_organization(request: OrganizationCreate):
         )
 
 
+@router.post("/bulk-create", response_model=OrganizationBulkCreateResponse)
+async def bulk_create_organizations(request: OrganizationBulkCreate):
+    """
+    Create many organizations in one request.
+    
+    - Accepts up to the configured maximum number of organizations
+    - Hashes passwords in parallel and writes organizations and admins in bulk
+    - Reports success or failure for each item; one failure does not stop the rest
+    """
+    
+    if len(request.organizations) > settings.ORG_BULK_CREATE_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.ORG_BULK_CREATE_MAX_ITEMS} organizations can be created per request"
+        )
+    
+    results = await organization_service.bulk_create_organizations(
+        [item.model_dump() for item in request.organizations]
+    )
+    created = sum(1 for result in results if result["success"])
+    
+    return OrganizationBulkCreateResponse(
+        created=created,
+        failed=len(results) - created,
+        results=results
+    )
+
+
 @router.get("/get", response_model=OrganizationResponse)
 async def get_organization(organization_name: str):
     """
@@ -73,7 +117,7 @@ async def get_organization(organization_name: str):
     - Returns 404 if organization does not exist
     """
     
-    organization = organization_service.get_organization_by_name(organization_name)
+    organization = await organization_service.get_organization_by_name(organization_name)
     
     if not organization:
         raise HTTPException(
@@ -85,81 +129,127 @@ async def get_organization(organization_name: str):
         organization_id=organization.organization_id,
         organization_name=organization.organization_name,
         collection_name=organization.collection_name,
+        storage_mode=organization.storage_mode,
         admin_email=organization.admin_email,
         created_at=organization.created_at,
         updated_at=organization.updated_at
     )
 
 
+@router.get("/list", response_model=OrganizationListResponse, response_model_exclude_unset=True)
+async def list_organizations(
+    limit: Optional[int] = Query(None, ge=1),
+    page_token: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_admin: TokenData = Depends(get_current_admin)
+):
+    """
+    List organizations, one page at a time.
+    
+    - Requires authentication
+    - Admin ids and emails are not listed
+    - Pages are ordered by organization ID and fetched with keyset pagination
+    - Pass the returned next_page_token to get the following page
+    - limit is capped at the configured maximum page size
+    - fields is an optional comma-separated projection (organization_id is always included)
+    """
+    
+    page_size = min(limit or settings.ORG_LIST_DEFAULT_PAGE_SIZE, settings.ORG_LIST_MAX_PAGE_SIZE)
+    
+    projection = None
+    if fields:
+        projection = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in projection if field not in ORGANIZATION_LIST_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown)}"
+            )
+    
+    try:
+        organizations, next_page_token = await organization_service.list_organizations(
+            limit=page_size,
+            page_token=page_token,
+            fields=projection
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return OrganizationListResponse(
+        organizations=organizations,
+        next_page_token=next_page_token
+    )
+
+
 @router.put("/update", response_model=OrganizationResponse)
-async def update_organization(request: OrganizationUpdate):
+async def update_organization(request: OrganizationUpdate, http_request: Request):
     """
     Update an organization (rename).
     
-    - Validates admin credentials
-    - Creates a new collection with the new name
-    - Syncs existing data to the new collection
-    - Deletes the old collection
+    - Rate limited per client IP and per email (429 when exceeded)
+    - Validates admin credentials (one password check)
+    - Updates the organization name; tenant data is keyed by organization ID
+      and stays where it is, so the rename takes the same time at any data size
     """
     
     # Check if the new organization name already exists (and it's not the same organization)
-    existing_org = organization_service.get_organization_by_name(request.organization_name)
+    existing_org = await organization_service.get_organization_by_name(request.organization_name)
     if existing_org:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Organization with name '{request.organization_name}' already exists"
         )
     
-    # Get admin to verify credentials
-    admin = organization_service.authenticate_admin(request.email, request.password)
+    # Get admin to verify credentials (rate limited before any bcrypt work)
+    await rate_limiter.check_credentials(client_ip(http_request), request.email)
+    admin = await organization_service.authenticate_admin(request.email, request.password)
     if not admin:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
         )
     
-    # Get the organization by admin
-    old_org = organization_service.get_organization_by_id(admin.organization_id)
-    if not old_org:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Organization not found"
-        )
-    
     try:
-        # Update organization
-        updated_org = organization_service.update_organization(
-            old_organization_name=old_org.organization_name,
-            new_organization_name=request.organization_name,
-            email=request.email,
-            password=request.password
+        # Rename the admin's organization
+        updated_org = await organization_service.update_organization(
+            organization_id=admin.organization_id,
+            new_organization_name=request.organization_name
         )
-        
-        if not updated_org:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to update organization"
-            )
-        
-        return OrganizationResponse(
-            organization_id=updated_org.organization_id,
-            organization_name=updated_org.organization_name,
-            collection_name=updated_org.collection_name,
-            admin_email=updated_org.admin_email,
-            created_at=updated_org.created_at,
-            updated_at=updated_org.updated_at
+    except OrganizationAlreadyExistsError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Organization with name '{request.organization_name}' already exists"
         )
-    
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error updating organization: {str(e)}"
         )
+    
+    if not updated_org:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Organization not found"
+        )
+    
+    return OrganizationResponse(
+        organization_id=updated_org.organization_id,
+        organization_name=updated_org.organization_name,
+        collection_name=updated_org.collection_name,
+        storage_mode=updated_org.storage_mode,
+        admin_email=updated_org.admin_email,
+        created_at=updated_org.created_at,
+        updated_at=updated_org.updated_at
+    )
 
 
-@router.delete("/delete", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/delete", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def delete_organization(
     request: OrganizationDelete,
+    response: Response,
     current_admin: TokenData = Depends(get_current_admin)
 ):
     """
@@ -167,36 +257,29 @@ async def delete_organization(
     
     - Requires authentication
     - Only the admin of the organization can delete it
-    - Deletes the organization collection and metadata
+    - Deletes the organization collection and metadata in a background job
+    - Returns 202 with the job; follow it at GET /jobs/{job_id} (Location header)
+    - Repeating the request while the delete is pending returns the same job
     """
     
     # Verify that the organization exists
-    organization = organization_service.get_organization_by_name(request.organization_name)
+    organization = await organization_service.get_organization_by_name(request.organization_name)
     if not organization:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Organization with name '{request.organization_name}' not found"
         )
     
-    try:
-        # Delete organization
-        success = organization_service.delete_organization(
-            organization_name=request.organization_name,
-            admin_id=current_admin.admin_id
-        )
-        
-        if not success:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You do not have permission to delete this organization"
-            )
-        
-        return None
-    
-    except HTTPException:
-        raise
-    except Exception as e:
+    # Verify that the requesting admin owns this organization
+    if organization.admin_id != current_admin.admin_id:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error deleting organization: {str(e)}"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to delete this organization"
         )
+    
+    # Refuse now (503) rather than fail the job if the tenant is moving between clusters
+    await placement_router.get_tenant_database(organization.organization_id, for_write=True)
+    
+    job = await job_runner.submit(DELETE_ORGANIZATION, organization.organization_id, dedupe=True)
+    response.headers["Location"] = f"/jobs/{job['_id']}"
+    return job_response(job)
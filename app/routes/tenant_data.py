@@ -0,0 +1,255 @@
+import json
+from typing import Any, Dict
+from fastapi import APIRouter, HTTPException, status, Depends, Body, Request, Response
+from fastapi.responses import StreamingResponse
+from app.schemas import (
+    TenantDocumentCreated,
+    TenantQuery,
+    TenantExportQuery,
+    TenantQueryResponse,
+    TenantImportResponse,
+    JobResponse,
+    TokenData
+)
+from app.tenant_data import tenant_data_service, TenantNotFoundError
+from app.jobs import job_runner, EXPORT_DOCUMENTS
+from app.routes.jobs import job_response
+from app.dependencies import get_current_admin
+from app.config import settings
+
+
+router = APIRouter(prefix="/data", tags=["Tenant Data"])
+
+# Request content types accepted by /data/import
+IMPORT_CONTENT_TYPES = {
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+}
+
+
+def _tenant_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Organization not found"
+    )
+
+
+def _document_not_found(document_id: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Document '{document_id}' not found"
+    )
+
+
+@router.post("/documents", response_model=TenantDocumentCreated, status_code=status.HTTP_201_CREATED)
+async def insert_document(
+    document: Dict[str, Any] = Body(...),
+    current_admin: TokenData = Depends(get_current_admin)
+):
+    """
+    Insert a document into the organization's collection.
+    
+    - The organization is taken from the JWT token
+    - Extended JSON values such as {"$date": ...} are accepted
+    """
+    
+    try:
+        document_id = await tenant_data_service.insert_document(current_admin.organization_id, document)
+    except TenantNotFoundError:
+        raise _tenant_not_found()
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    return TenantDocumentCreated(document_id=document_id)
+
+
+@router.get("/documents/{document_id}")
+async def get_document(
+    document_id: str,
+    current_admin: TokenData = Depends(get_current_admin)
+):
+    """
+    Get a document from the organization's collection by id.
+    
+    - Returns the document as relaxed extended JSON
+    """
+    
+    try:
+        document = await tenant_data_service.get_document(current_admin.organization_id, document_id)
+    except TenantNotFoundError:
+        raise _tenant_not_found()
+    
+    if document is None:
+        raise _document_not_found(document_id)
+    
+    return tenant_data_service.to_json(document)
+
+
+@router.patch("/documents/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def update_document(
+    document_id: str,
+    fields: Dict[str, Any] = Body(...),
+    current_admin: TokenData = Depends(get_current_admin)
+):
+    """
+    Update fields of a document in the organization's collection.
+    
+    - Given fields are set; other fields are left unchanged
+    """
+    
+    try:
+        found = await tenant_data_service.update_document(current_admin.organization_id, document_id, fields)
+    except TenantNotFoundError:
+        raise _tenant_not_found()
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if not found:
+        raise _document_not_found(document_id)
+    
+    return None
+
+
+@router.delete("/documents/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_document(
+    document_id: str,
+    current_admin: TokenData = Depends(get_current_admin)
+):
+    """
+    Delete a document from the organization's collection.
+    """
+    
+    try:
+        found = await tenant_data_service.delete_document(current_admin.organization_id, document_id)
+    except TenantNotFoundError:
+        raise _tenant_not_found()
+    
+    if not found:
+        raise _document_not_found(document_id)
+    
+    return None
+
+
+@router.post("/query", response_model=TenantQueryResponse)
+async def query_documents(
+    request: TenantQuery,
+    current_admin: TokenData = Depends(get_current_admin)
+):
+    """
+    Query documents in the organization's collection.
+    
+    - filter and projection use MongoDB query syntax (JavaScript operators are rejected)
+    - limit is capped at the configured maximum
+    """
+    
+    limit = min(request.limit or settings.TENANT_QUERY_MAX_LIMIT, settings.TENANT_QUERY_MAX_LIMIT)
+    
+    try:
+        documents = await tenant_data_service.query_documents(
+            current_admin.organization_id,
+            filter=request.filter,
+            projection=request.projection,
+            sort=request.sort,
+            limit=limit
+        )
+    except TenantNotFoundError:
+        raise _tenant_not_found()
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    return TenantQueryResponse(
+        count=len(documents),
+        documents=[tenant_data_service.to_json(document) for document in documents]
+    )
+
+
+@router.post("/export")
+async def export_documents(
+    request: TenantExportQuery,
+    current_admin: TokenData = Depends(get_current_admin)
+):
+    """
+    Export matching documents as newline-delimited JSON.
+    
+    - Streams from a server-side cursor; the result is never buffered in full
+    - Each line is one document in relaxed extended JSON
+    """
+    
+    try:
+        chunks = await tenant_data_service.export_documents(
+            current_admin.organization_id,
+            filter=request.filter,
+            projection=request.projection
+        )
+    except TenantNotFoundError:
+        raise _tenant_not_found()
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    return StreamingResponse(chunks, media_type="application/x-ndjson")
+
+
+@router.post("/export/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def export_documents_job(
+    request: TenantExportQuery,
+    response: Response,
+    current_admin: TokenData = Depends(get_current_admin)
+):
+    """
+    Export matching documents in a background job.
+    
+    - Returns 202 with the job; follow it at GET /jobs/{job_id} (Location header)
+    - When it has succeeded, download the NDJSON from GET /jobs/{job_id}/result
+    - Use this instead of /data/export when the export would outlast a proxy timeout
+    """
+    
+    try:
+        total = await tenant_data_service.count_documents(current_admin.organization_id, request.filter)
+    except TenantNotFoundError:
+        raise _tenant_not_found()
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    # Stored as JSON text: filters contain $-prefixed keys
+    job = await job_runner.submit(
+        EXPORT_DOCUMENTS,
+        current_admin.organization_id,
+        params={"filter": json.dumps(request.filter), "projection": json.dumps(request.projection)},
+        total=total
+    )
+    response.headers["Location"] = f"/jobs/{job['_id']}"
+    return job_response(job)
+
+
+@router.post("/import", response_model=TenantImportResponse)
+async def import_documents(
+    request: Request,
+    current_admin: TokenData = Depends(get_current_admin)
+):
+    """
+    Import documents from a streamed NDJSON or CSV request body.
+    
+    - Send Content-Type application/x-ndjson (one JSON object per line) or text/csv (header row first)
+    - The body is parsed as it arrives and written in batches; memory use stays flat
+    - Returns inserted and failed counts, with the first few error messages
+    """
+    
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    import_format = IMPORT_CONTENT_TYPES.get(content_type)
+    if import_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Content-Type must be one of: {', '.join(IMPORT_CONTENT_TYPES)}"
+        )
+    
+    try:
+        result = await tenant_data_service.import_documents(
+            current_admin.organization_id,
+            request.stream(),
+            import_format
+        )
+    except TenantNotFoundError:
+        raise _tenant_not_found()
+    
+    return TenantImportResponse(**result)
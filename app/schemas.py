@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import Any, Dict, List, Literal, Optional
 from datetime import datetime
 
 
@@ -12,6 +12,30 @@ class OrganizationCreate(OrganizationBase):
     """Schema for creating an organization"""
     email: EmailStr
     password: str = Field(..., min_length=8)
+    # Own collection or the shared tenant collection; defaults to TENANT_STORAGE_MODE
+    storage_mode: Optional[Literal["collection", "shared"]] = None
+
+
+class OrganizationBulkCreate(BaseModel):
+    """Schema for creating many organizations in one request"""
+    organizations: List[OrganizationCreate] = Field(..., min_length=1)
+
+
+class OrganizationBulkCreateResult(BaseModel):
+    """Schema for the outcome of one item in a bulk create"""
+    index: int
+    organization_name: str
+    success: bool
+    organization_id: Optional[str] = None
+    collection_name: Optional[str] = None
+    error: Optional[str] = None
+
+
+class OrganizationBulkCreateResponse(BaseModel):
+    """Schema for bulk create response"""
+    created: int
+    failed: int
+    results: List[OrganizationBulkCreateResult]
 
 
 class OrganizationUpdate(BaseModel):
@@ -25,6 +49,7 @@ class OrganizationResponse(OrganizationBase):
     """Schema for organization response"""
     organization_id: str
     collection_name: str
+    storage_mode: str = "collection"
     admin_email: str
     created_at: datetime
     updated_at: Optional[datetime] = None
@@ -33,6 +58,22 @@ class OrganizationResponse(OrganizationBase):
         from_attributes = True
 
 
+class OrganizationListItem(BaseModel):
+    """Schema for one organization in a listing (fields depend on the projection)"""
+    organization_id: str
+    organization_name: Optional[str] = None
+    collection_name: Optional[str] = None
+    storage_mode: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class OrganizationListResponse(BaseModel):
+    """Schema for a page of organizations"""
+    organizations: List[OrganizationListItem]
+    next_page_token: Optional[str] = None
+
+
 class OrganizationGet(BaseModel):
     """Schema for getting organization by name"""
     organization_name: str
@@ -63,3 +104,56 @@ class TokenData(BaseModel):
     admin_id: Optional[str] = None
     organization_id: Optional[str] = None
     email: Optional[str] = None
+
+
+class TenantDocumentCreated(BaseModel):
+    """Schema for a newly inserted tenant document"""
+    document_id: str
+
+
+class TenantQuery(BaseModel):
+    """Schema for querying tenant documents (filter and projection accept extended JSON)"""
+    filter: Dict[str, Any] = Field(default_factory=dict)
+    projection: Optional[Dict[str, Any]] = None
+    sort: Optional[Dict[str, int]] = None
+    limit: Optional[int] = Field(None, ge=1)
+
+
+class TenantExportQuery(BaseModel):
+    """Schema for exporting tenant documents as NDJSON"""
+    filter: Dict[str, Any] = Field(default_factory=dict)
+    projection: Optional[Dict[str, Any]] = None
+
+
+class TenantQueryResponse(BaseModel):
+    """Schema for tenant query results"""
+    count: int
+    documents: List[Dict[str, Any]]
+
+
+class TenantImportResponse(BaseModel):
+    """Schema for the outcome of a streaming import"""
+    inserted: int
+    failed: int
+    errors: List[str] = []
+
+
+class JobProgress(BaseModel):
+    """Schema for how far a background job has got (total is None when unknown)"""
+    done: int = 0
+    total: Optional[int] = None
+
+
+class JobResponse(BaseModel):
+    """Schema for a background job and its outcome"""
+    job_id: str
+    type: str
+    state: Literal["queued", "running", "succeeded", "failed"]
+    organization_id: str
+    progress: JobProgress
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -1,16 +1,17 @@
 """
 Database seeding module for initial demo data
 """
-from app.services import OrganizationService
+import asyncio
+from app.services import organization_service
 from app.database import db_connection
+from app.placement import placement_router
+from app.tenant_storage import get_tenant_store
 from datetime import datetime
 
 
-def seed_demo_data():
+async def seed_demo_data():
     """Seed the database with sample organizations and data"""
     try:
-        org_service = OrganizationService()
-        
         # Sample organizations to create
         sample_orgs = [
             {
@@ -30,31 +31,30 @@ def seed_demo_data():
             }
         ]
         
-        created_orgs = []
-        
-        for org_data in sample_orgs:
-            # Check if org already exists
-            if org_service.organization_exists(org_data["name"]):
+        async def seed_organization(org_data: dict) -> dict:
+            # One lookup instead of an exists check followed by a fetch
+            existing_org = await organization_service.get_organization_by_name(org_data["name"])
+            if existing_org:
                 print(f"✓ Organization '{org_data['name']}' already exists")
-                existing_org = org_service.get_organization_by_name(org_data["name"])
-                created_orgs.append({
+                return {
                     "name": org_data["name"],
                     "email": org_data["email"],
                     "password": org_data["password"],
                     "collection": existing_org.collection_name
-                })
-                continue
+                }
             
             # Create new organization
-            org = org_service.create_organization(
+            org = await organization_service.create_organization(
                 organization_name=org_data["name"],
                 email=org_data["email"],
                 password=org_data["password"]
             )
             
-            # Add sample data to the organization's collection
-            org_db = db_connection.get_master_db().client[db_connection.get_master_db().name]
-            org_collection = org_db[org.collection_name]
+            # Add sample data to the organization's collection (or its slice of the shared one)
+            tenant_db = await placement_router.get_tenant_database(org.organization_id, for_write=True)
+            store = await get_tenant_store(
+                org.storage_mode, org.organization_id, org.collection_name, tenant_db
+            )
             
             # Insert sample records
             sample_records = [
@@ -78,20 +78,23 @@ def seed_demo_data():
                 }
             ]
             
-            org_collection.insert_many(sample_records)
+            await store.collection.insert_many([store.prepare(record) for record in sample_records])
+            
+            print(f"✓ Created organization: {org.organization_name}")
+            print(f"  - Collection: {org.collection_name}")
+            print(f"  - Admin Email: {org.admin_email}")
+            print(f"  - Sample records added: 3 employees")
             
-            created_orgs.append({
+            return {
                 "name": org.organization_name,
                 "email": org.admin_email,
                 "password": org_data["password"],
                 "collection": org.collection_name,
                 "status": "created"
-            })
-            
-            print(f"✓ Created organization: {org.organization_name}")
-            print(f"  - Collection: {org.collection_name}")
-            print(f"  - Admin Email: {org.admin_email}")
-            print(f"  - Sample records added: 3 employees")
+            }
+        
+        # Organizations are independent, so seed them concurrently
+        created_orgs = await asyncio.gather(*[seed_organization(org_data) for org_data in sample_orgs])
         
         print("\n" + "="*60)
         print("DEMO DATA CREATED SUCCESSFULLY")
@@ -113,4 +116,8 @@ def seed_demo_data():
 
 
 if __name__ == "__main__":
-    seed_demo_data()
+    async def main():
+        await seed_demo_data()
+        await db_connection.close()
+    
+    asyncio.run(main())
@@ -1,204 +1,617 @@
-from typing import Optional, List
+import asyncio
+import base64
+import os
+from typing import Awaitable, Callable, Dict, Optional, List, Tuple
 from datetime import datetime
 from bson import ObjectId
-from pymongo.collection import Collection
-from app.database import db_connection
+from bson.errors import InvalidId
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
+from app.database import db_connection, DUPLICATE_KEY
 from app.models import Organization, Admin
 from app.auth import auth_service
+from app.cache import LRUTTLCache
+from app.placement import placement_router
+from app.tenant_storage import SHARED_MODE, delete_shared_documents
+from app.config import settings
+
+
+# Organization fields that may be requested from the listing endpoint (admin
+# identities are left out so the listing cannot be used to enumerate logins)
+ORGANIZATION_LIST_FIELDS = (
+    "organization_name",
+    "collection_name",
+    "storage_mode",
+    "created_at",
+    "updated_at"
+)
+
+# Server error codes for an index that conflicts with an existing one of the same name
+INDEX_OPTIONS_CONFLICT = 85
+INDEX_KEY_SPECS_CONFLICT = 86
+
+# Admin fields read at login: enough to verify the password and build the token and response
+ADMIN_LOGIN_FIELDS = {"email": 1, "hashed_password": 1, "organization_id": 1, "organization_name": 1}
+
+
+class OrganizationAlreadyExistsError(Exception):
+    """Raised when an organization name is already taken"""
+    pass
+
+
+class AdminEmailAlreadyExistsError(Exception):
+    """Raised when an admin email is already registered"""
+    pass
+
+
+class IndexBuildError(Exception):
+    """Raised when a master index cannot be built from the data already stored"""
+    pass
 
 
 class OrganizationService:
     """Service class for organization-related database operations"""
     
     def __init__(self):
-        self.master_db = db_connection.get_master_db()
-        self.organizations_collection: Collection = db_connection.get_collection("organizations")
-        self.admins_collection: Collection = db_connection.get_collection("admins")
+        # Organization metadata cache, keyed by ("name", ...) and ("id", ...)
+        self.organization_cache = LRUTTLCache(
+            max_size=settings.ORG_CACHE_SIZE,
+            ttl_seconds=settings.ORG_CACHE_TTL_SECONDS
+        )
+    
+    # Collections are resolved on use so importing this module never creates a client
+    @property
+    def master_db(self) -> AsyncDatabase:
+        return db_connection.get_master_db()
     
-    def _generate_collection_name(self, organization_name: str) -> str:
-        """Generate a collection name for an organization"""
-        # Sanitize organization name for collection naming
-        sanitized_name = organization_name.lower().replace(" ", "_").replace("-", "_")
-        return f"org_{sanitized_name}"
+    @property
+    def organizations_collection(self) -> AsyncCollection:
+        return db_connection.get_collection("organizations")
     
-    def organization_exists(self, organization_name: str) -> bool:
+    @property
+    def admins_collection(self) -> AsyncCollection:
+        return db_connection.get_collection("admins")
+    
+    async def ensure_indexes(self):
+        """
+        Create the master collection indexes (idempotent, run at startup).
+        
+        Raises IndexBuildError when existing documents prevent a build, e.g.
+        duplicate organization names or admin emails left by writes made
+        before the unique indexes existed. Retrying cannot fix that; the
+        duplicates have to be resolved first.
+        """
+        await self._create_index(
+            self.organizations_collection, [("organization_name", ASCENDING)],
+            unique=True, name="organization_name_unique"
+        )
+        await self._create_index(self.organizations_collection, [("admin_id", ASCENDING)], name="admin_id")
+        await self._create_index(
+            self.admins_collection, [("email", ASCENDING)], unique=True, name="email_unique"
+        )
+        await self._create_index(self.admins_collection, [("organization_id", ASCENDING)], name="organization_id")
+    
+    async def _create_index(self, collection: AsyncCollection, keys: List[Tuple[str, int]], **kwargs):
+        """create_index, turning data problems into IndexBuildError"""
+        try:
+            await collection.create_index(keys, **kwargs)
+        except OperationFailure as e:
+            # Duplicate values for a unique index, or an index of that name with other options
+            if e.code not in (DUPLICATE_KEY, INDEX_OPTIONS_CONFLICT, INDEX_KEY_SPECS_CONFLICT):
+                raise
+            raise IndexBuildError(
+                f"Cannot build index {kwargs.get('name')} on {collection.name}: "
+                f"{e.details.get('errmsg', e) if e.details else e}"
+            ) from e
+    
+    def reset_after_fork(self):
+        """Start a forked worker with an empty metadata cache"""
+        self.organization_cache.clear()
+    
+    def _cache_organization(self, organization: Organization):
+        """Cache an organization under both its name and its id"""
+        self.organization_cache.set(("name", organization.organization_name), organization)
+        self.organization_cache.set(("id", organization.organization_id), organization)
+    
+    def _invalidate_organization(self, *organization_names: str, organization_id: Optional[str] = None):
+        """Drop cached entries for the given names and id"""
+        self.organization_cache.delete(*[("name", name) for name in organization_names])
+        if organization_id:
+            self.organization_cache.delete(("id", organization_id))
+    
+    async def warm_organization_cache(self, limit: int) -> int:
+        """Load up to limit organizations into the metadata cache; returns how many"""
+        if not self.organization_cache.enabled or limit <= 0:
+            return 0
+        limit = min(limit, self.organization_cache.max_size // 2)
+        cursor = self.organizations_collection.find({}, sort=[("_id", ASCENDING)], limit=limit)
+        warmed = 0
+        async for org_doc in cursor:
+            self._cache_organization(Organization.from_dict(org_doc))
+            warmed += 1
+        return warmed
+    
+    def _generate_collection_name(self, organization_id: ObjectId) -> str:
+        """
+        Collection name for an organization's own tenant collection.
+        
+        Keyed by the immutable organization id, so renaming an organization
+        never moves its data. Organizations created before this were named
+        org_<sanitized name>; python -m app.migrate_collection_names moves
+        them over.
+        """
+        return f"org_{organization_id}"
+    
+    async def organization_exists(self, organization_name: str) -> bool:
         """Check if an organization with the given name exists"""
-        result = self.organizations_collection.find_one({"organization_name": organization_name})
+        result = await self.organizations_collection.find_one({"organization_name": organization_name})
         return result is not None
     
-    def email_exists(self, email: str) -> bool:
+    async def email_exists(self, email: str) -> bool:
         """Check if an admin with the given email exists"""
-        result = self.admins_collection.find_one({"email": email})
+        result = await self.admins_collection.find_one({"email": email})
         return result is not None
     
-    def create_organization(
+    async def create_organization(
         self, 
         organization_name: str, 
         email: str, 
-        password: str
+        password: str,
+        storage_mode: Optional[str] = None
     ) -> Organization:
-        """Create a new organization with an admin user"""
+        """
+        Create a new organization with an admin user.
+        
+        storage_mode picks a collection of its own or the shared tenant
+        collection, defaulting to TENANT_STORAGE_MODE.
         
-        # Generate collection name
-        collection_name = self._generate_collection_name(organization_name)
+        Uniqueness is enforced by the master collection indexes, so a taken
+        name or email surfaces as OrganizationAlreadyExistsError or
+        AdminEmailAlreadyExistsError instead of being pre-checked.
+        """
         
         # Hash the password
-        hashed_password = auth_service.get_password_hash(password)
+        hashed_password = await auth_service.get_password_hash_async(password)
+        
+        # Build both documents with client-generated ids so each is written once
+        org_doc, admin_doc = self._build_organization_documents(
+            ObjectId(), ObjectId(), organization_name, email, hashed_password, datetime.utcnow(), storage_mode
+        )
+        
+        if settings.MONGODB_USE_TRANSACTIONS and db_connection.supports_transactions:
+            await self._insert_organization_in_transaction(org_doc, admin_doc)
+            try:
+                await self._create_tenant_collection(org_doc)
+            except Exception:
+                # The tenant may live on another cluster, so its collection is created
+                # after the commit; without it the organization must not remain
+                await self.organizations_collection.delete_one({"_id": org_doc["_id"]})
+                await self.admins_collection.delete_one({"_id": admin_doc["_id"]})
+                await placement_router.remove(org_doc["_id"])
+                raise
+        else:
+            await self._insert_organization(org_doc, admin_doc)
+        
+        self._invalidate_organization(organization_name, organization_id=str(org_doc["_id"]))
+        return Organization.from_dict(org_doc)
+    
+    async def _insert_organization(self, org_doc: dict, admin_doc: dict):
+        """
+        Write the organization, then the admin and tenant collection concurrently.
+        
+        The organization insert claims the unique name first. If the admin
+        email turns out to be taken, the organization (and the collection, if
+        this call created it) are removed again.
+        """
+        try:
+            await self.organizations_collection.insert_one(org_doc)
+        except DuplicateKeyError:
+            raise OrganizationAlreadyExistsError(org_doc["organization_name"])
+        
+        admin_result, collection_result = await asyncio.gather(
+            self.admins_collection.insert_one(admin_doc),
+            self._create_tenant_collection(org_doc),
+            return_exceptions=True
+        )
         
-        # Create organization document
-        org_data = {
+        admin_failed = isinstance(admin_result, BaseException)
+        collection_failed = isinstance(collection_result, BaseException)
+        if not admin_failed and not collection_failed:
+            return
+        
+        # Roll back whatever was written
+        await self.organizations_collection.delete_one({"_id": org_doc["_id"]})
+        if not admin_failed:
+            await self.admins_collection.delete_one({"_id": admin_doc["_id"]})
+        if collection_result is True:
+            tenant_db = await placement_router.get_tenant_database(org_doc["_id"])
+            await db_connection.drop_collection(org_doc["collection_name"], tenant_db)
+        await placement_router.remove(org_doc["_id"])
+        
+        if isinstance(admin_result, DuplicateKeyError):
+            raise AdminEmailAlreadyExistsError(admin_doc["email"])
+        raise admin_result if admin_failed else collection_result
+    
+    async def _create_tenant_collection(self, org_doc: dict) -> bool:
+        """Place a new tenant on the default cluster and create its collection there (none when shared)"""
+        tenant_db = await placement_router.place_new_tenant(org_doc["_id"])
+        if org_doc["storage_mode"] == SHARED_MODE:
+            return False
+        return await db_connection.create_collection(org_doc["collection_name"], tenant_db)
+    
+    async def _insert_organization_in_transaction(self, org_doc: dict, admin_doc: dict):
+        """Write the organization and admin atomically (requires a replica set)"""
+        
+        async def write(session):
+            try:
+                await self.organizations_collection.insert_one(org_doc, session=session)
+            except DuplicateKeyError:
+                raise OrganizationAlreadyExistsError(org_doc["organization_name"])
+            try:
+                await self.admins_collection.insert_one(admin_doc, session=session)
+            except DuplicateKeyError:
+                raise AdminEmailAlreadyExistsError(admin_doc["email"])
+        
+        async with db_connection.start_session() as session:
+            await session.with_transaction(write)
+    
+    def _build_organization_documents(
+        self,
+        organization_id: ObjectId,
+        admin_id: ObjectId,
+        organization_name: str,
+        email: str,
+        hashed_password: str,
+        created_at: datetime,
+        storage_mode: Optional[str] = None
+    ) -> Tuple[dict, dict]:
+        """Build the final organization and admin documents for pre-generated ids"""
+        # BSON dates have millisecond precision; truncate so the returned
+        # Organization matches what a later read from MongoDB would give
+        created_at = created_at.replace(microsecond=created_at.microsecond // 1000 * 1000)
+        storage_mode = storage_mode or settings.TENANT_STORAGE_MODE
+        org_doc = {
+            "_id": organization_id,
             "organization_name": organization_name,
-            "collection_name": collection_name,
-            "admin_id": None,  # Will be updated after admin creation
+            "collection_name": (
+                settings.TENANT_SHARED_COLLECTION if storage_mode == SHARED_MODE
+                else self._generate_collection_name(organization_id)
+            ),
+            "storage_mode": storage_mode,
+            "admin_id": str(admin_id),
             "admin_email": email,
-            "created_at": datetime.utcnow(),
+            "created_at": created_at,
             "updated_at": None
         }
-        
-        # Insert organization
-        org_result = self.organizations_collection.insert_one(org_data)
-        organization_id = str(org_result.inserted_id)
-        
-        # Create admin user
-        admin_data = {
+        admin_doc = {
+            "_id": admin_id,
             "email": email,
             "hashed_password": hashed_password,
-            "organization_id": organization_id,
-            "created_at": datetime.utcnow()
+            "organization_id": str(organization_id),
+            "organization_name": organization_name,
+            "created_at": created_at
         }
+        return org_doc, admin_doc
+    
+    async def _insert_many_unordered(self, collection: AsyncCollection, documents: List[dict]) -> Dict[int, int]:
+        """Insert documents unordered and return {index: error code} for the ones that failed"""
+        if not documents:
+            return {}
+        try:
+            await collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            return {error["index"]: error.get("code") for error in e.details.get("writeErrors", [])}
+        return {}
+    
+    async def bulk_create_organizations(self, items: List[dict]) -> List[dict]:
+        """
+        Create many organizations at once and report success per item.
         
-        # Insert admin
-        admin_result = self.admins_collection.insert_one(admin_data)
-        admin_id = str(admin_result.inserted_id)
+        Passwords are hashed in parallel on the hashing pool (never using
+        more than its worker count, so logins can still queue). Ids are
+        generated client-side so organizations and admins are each written
+        with a single unordered insert_many. Organizations whose admin
+        insert or tenant collection fails are removed again and reported
+        as failed items.
+        """
+        results = [
+            {"index": index, "organization_name": item["organization_name"], "success": False}
+            for index, item in enumerate(items)
+        ]
         
-        # Update organization with admin_id
-        self.organizations_collection.update_one(
-            {"_id": org_result.inserted_id},
-            {"$set": {"admin_id": admin_id}}
-        )
+        semaphore = asyncio.Semaphore(auth_service.hashing_pool.max_workers)
         
-        # Create dynamic collection for the organization
-        db_connection.create_collection(collection_name)
+        async def hash_password(password: str) -> str:
+            async with semaphore:
+                return await auth_service.get_password_hash_async(password)
         
-        # Retrieve and return the created organization
-        org_doc = self.organizations_collection.find_one({"_id": org_result.inserted_id})
-        return Organization.from_dict(org_doc)
+        hashed_passwords = await asyncio.gather(*[hash_password(item["password"]) for item in items])
+        
+        created_at = datetime.utcnow()
+        org_docs, admin_docs = [], []
+        for item, hashed_password in zip(items, hashed_passwords):
+            org_doc, admin_doc = self._build_organization_documents(
+                ObjectId(), ObjectId(), item["organization_name"], item["email"], hashed_password, created_at,
+                item.get("storage_mode")
+            )
+            org_docs.append(org_doc)
+            admin_docs.append(admin_doc)
+        
+        # Insert organizations
+        org_errors = await self._insert_many_unordered(self.organizations_collection, org_docs)
+        for index, code in org_errors.items():
+            results[index]["error"] = (
+                f"Organization with name '{items[index]['organization_name']}' already exists"
+                if code == DUPLICATE_KEY else "Failed to create organization"
+            )
+        
+        # Insert admins for the organizations that were written
+        inserted = [index for index in range(len(items)) if index not in org_errors]
+        admin_errors = await self._insert_many_unordered(self.admins_collection, [admin_docs[i] for i in inserted])
+        rolled_back = []
+        for position, code in admin_errors.items():
+            index = inserted[position]
+            results[index]["error"] = (
+                f"Admin with email '{items[index]['email']}' already exists"
+                if code == DUPLICATE_KEY else "Failed to create admin"
+            )
+            rolled_back.append(org_docs[index]["_id"])
+        if rolled_back:
+            await self.organizations_collection.delete_many({"_id": {"$in": rolled_back}})
+        
+        # Create tenant collections for the organizations that succeeded
+        created = [index for position, index in enumerate(inserted) if position not in admin_errors]
+        failed = []
+        try:
+            tenant_db = await placement_router.place_new_tenants([org_docs[i]["_id"] for i in created])
+        except Exception:
+            failed = created
+        else:
+            own_collection = [i for i in created if org_docs[i]["storage_mode"] != SHARED_MODE]
+            outcomes = await asyncio.gather(*[
+                db_connection.create_collection(org_docs[i]["collection_name"], tenant_db)
+                for i in own_collection
+            ], return_exceptions=True)
+            failed = [i for i, outcome in zip(own_collection, outcomes) if isinstance(outcome, BaseException)]
+        
+        # Organizations without their collection are removed and reported as failed
+        if failed:
+            for index in failed:
+                results[index]["error"] = "Failed to create tenant collection"
+            await self.organizations_collection.delete_many({"_id": {"$in": [org_docs[i]["_id"] for i in failed]}})
+            await self.admins_collection.delete_many({"_id": {"$in": [admin_docs[i]["_id"] for i in failed]}})
+            for index in failed:
+                await placement_router.remove(org_docs[index]["_id"])
+            created = [index for index in created if index not in failed]
+        
+        self._invalidate_organization(*[items[i]["organization_name"] for i in created])
+        for index in created:
+            results[index].update({
+                "success": True,
+                "organization_id": str(org_docs[index]["_id"]),
+                "collection_name": org_docs[index]["collection_name"]
+            })
+        return results
     
-    def get_organization_by_name(self, organization_name: str) -> Optional[Organization]:
+    async def get_organization_by_name(self, organization_name: str) -> Optional[Organization]:
         """Get an organization by name"""
-        org_doc = self.organizations_collection.find_one({"organization_name": organization_name})
+        organization = self.organization_cache.get(("name", organization_name))
+        if organization:
+            return organization
+        
+        org_doc = await self.organizations_collection.find_one({"organization_name": organization_name})
         if org_doc:
-            return Organization.from_dict(org_doc)
+            organization = Organization.from_dict(org_doc)
+            self._cache_organization(organization)
+            return organization
         return None
     
-    def get_organization_by_id(self, organization_id: str) -> Optional[Organization]:
+    async def get_organization_by_id(self, organization_id: str) -> Optional[Organization]:
         """Get an organization by ID"""
+        organization = self.organization_cache.get(("id", organization_id))
+        if organization:
+            return organization
+        
         try:
-            org_doc = self.organizations_collection.find_one({"_id": ObjectId(organization_id)})
+            org_doc = await self.organizations_collection.find_one({"_id": ObjectId(organization_id)})
             if org_doc:
-                return Organization.from_dict(org_doc)
+                organization = Organization.from_dict(org_doc)
+                self._cache_organization(organization)
+                return organization
         except Exception:
             pass
         return None
     
-    def update_organization(
-        self, 
-        old_organization_name: str, 
-        new_organization_name: str,
-        email: str,
-        password: str
-    ) -> Optional[Organization]:
-        """Update an organization (rename) and sync data to new collection"""
+    async def get_writable_organization(self, organization_id: str) -> Optional[Organization]:
+        """
+        Get an organization for a tenant write, bypassing the cache.
         
-        # Get existing organization
-        org_doc = self.organizations_collection.find_one({"organization_name": old_organization_name})
-        if not org_doc:
+        Another worker may have deleted the organization, or be deleting it,
+        while this worker's cache still holds it; writes going through then
+        would recreate its collection or leave stray shared documents. Returns
+        None in both cases.
+        """
+        try:
+            org_doc = await self.organizations_collection.find_one(
+                {"_id": ObjectId(organization_id), "deleting": {"$exists": False}}
+            )
+        except InvalidId:
             return None
+        return Organization.from_dict(org_doc) if org_doc else None
+    
+    def _encode_page_token(self, last_id: ObjectId) -> str:
+        """Opaque continuation token for the page after last_id"""
+        return base64.urlsafe_b64encode(last_id.binary).decode().rstrip("=")
+    
+    def _decode_page_token(self, page_token: str) -> ObjectId:
+        """Inverse of _encode_page_token; raises ValueError for malformed tokens"""
+        try:
+            padded = page_token + "=" * (-len(page_token) % 4)
+            return ObjectId(base64.urlsafe_b64decode(padded))
+        except (InvalidId, ValueError, TypeError):
+            raise ValueError("Invalid page token")
+    
+    async def list_organizations(
+        self,
+        limit: int,
+        page_token: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        List organizations in _id order using keyset pagination.
         
-        old_collection_name = org_doc["collection_name"]
-        new_collection_name = self._generate_collection_name(new_organization_name)
+        Each page is an indexed range scan starting after the last _id of
+        the previous page, so cost per page does not grow with depth.
+        Returns the page and the token for the next one (None at the end).
+        """
+        query = {}
+        if page_token:
+            query["_id"] = {"$gt": self._decode_page_token(page_token)}
         
-        # Get admin and verify credentials
-        admin_doc = self.admins_collection.find_one({"_id": ObjectId(org_doc["admin_id"])})
-        if not admin_doc or admin_doc["email"] != email:
-            return None
+        projection = {field: 1 for field in (fields or ORGANIZATION_LIST_FIELDS)}
+        cursor = self.organizations_collection.find(
+            query, projection=projection, sort=[("_id", ASCENDING)], limit=limit + 1
+        )
+        documents = await cursor.to_list(None)
         
-        # Verify password
-        if not auth_service.verify_password(password, admin_doc["hashed_password"]):
+        next_token = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            next_token = self._encode_page_token(documents[-1]["_id"])
+        
+        for document in documents:
+            document["organization_id"] = str(document.pop("_id"))
+        return documents, next_token
+    
+    async def update_organization(
+        self,
+        organization_id: str,
+        new_organization_name: str
+    ) -> Optional[Organization]:
+        """
+        Rename an organization.
+        
+        Tenant collections are keyed by organization id and the display name
+        is metadata only, so a rename is one update of the organization
+        document (plus the admin's copy of the name) whatever the data size.
+        Credentials are checked by the caller. A name taken concurrently
+        raises OrganizationAlreadyExistsError via the unique index.
+        """
+        updated_at = datetime.utcnow()
+        updated_at = updated_at.replace(microsecond=updated_at.microsecond // 1000 * 1000)
+        try:
+            org_doc = await self.organizations_collection.find_one_and_update(
+                {"_id": ObjectId(organization_id)},
+                {"$set": {"organization_name": new_organization_name, "updated_at": updated_at}},
+                return_document=ReturnDocument.BEFORE
+            )
+        except DuplicateKeyError:
+            raise OrganizationAlreadyExistsError(new_organization_name)
+        if not org_doc:
             return None
         
-        # Create new collection
-        db_connection.create_collection(new_collection_name)
-        
-        # Copy data from old collection to new collection
-        old_collection = db_connection.get_collection(old_collection_name)
-        new_collection = db_connection.get_collection(new_collection_name)
-        
-        # Get all documents from old collection
-        documents = list(old_collection.find({}))
-        if documents:
-            new_collection.insert_many(documents)
-        
-        # Update organization document
-        self.organizations_collection.update_one(
-            {"_id": org_doc["_id"]},
-            {
-                "$set": {
-                    "organization_name": new_organization_name,
-                    "collection_name": new_collection_name,
-                    "updated_at": datetime.utcnow()
-                }
-            }
+        await self.admins_collection.update_one(
+            {"_id": ObjectId(org_doc["admin_id"])},
+            {"$set": {"organization_name": new_organization_name}}
         )
         
-        # Drop old collection
-        db_connection.drop_collection(old_collection_name)
+        self._invalidate_organization(
+            org_doc["organization_name"],
+            new_organization_name,
+            organization_id=organization_id
+        )
         
-        # Return updated organization
-        updated_doc = self.organizations_collection.find_one({"_id": org_doc["_id"]})
-        return Organization.from_dict(updated_doc)
+        org_doc.update(organization_name=new_organization_name, updated_at=updated_at)
+        return Organization.from_dict(org_doc)
     
-    def delete_organization(
-        self, 
-        organization_name: str,
-        admin_id: str
+    async def delete_organization(
+        self,
+        organization_id: str,
+        progress: Optional[Callable[[int, int], Awaitable[None]]] = None
     ) -> bool:
-        """Delete an organization and its associated collection"""
+        """
+        Delete an organization, its admin and its tenant data.
+        
+        Callers check that the requesting admin owns the organization. Tenant
+        data goes first and the organization document last, so an interrupted
+        delete can simply be run again; returns False once nothing is left.
+        Shared-mode documents are removed in batches of TENANT_COPY_BATCH_SIZE,
+        reporting progress(deleted, total) after each batch.
+        """
         
         # Get organization
-        org_doc = self.organizations_collection.find_one({"organization_name": organization_name})
+        org_doc = await self.organizations_collection.find_one({"_id": ObjectId(organization_id)})
         if not org_doc:
             return False
         
-        # Verify that the requesting admin owns this organization
-        if org_doc["admin_id"] != admin_id:
-            return False
-        
-        collection_name = org_doc["collection_name"]
+        # Refuse new tenant writes on every worker before the data goes
+        if "deleting" not in org_doc:
+            await self.organizations_collection.update_one(
+                {"_id": org_doc["_id"]}, {"$set": {"deleting": datetime.utcnow()}}
+            )
         
-        # Delete organization collection
-        db_connection.drop_collection(collection_name)
+        # Delete organization data from whichever cluster holds it
+        tenant_db = await placement_router.get_tenant_database(org_doc["_id"], for_write=True)
+        if org_doc.get("storage_mode") == SHARED_MODE:
+            await delete_shared_documents(tenant_db, org_doc["_id"], progress)
+        else:
+            await db_connection.drop_collection(org_doc["collection_name"], tenant_db)
+        await placement_router.remove(org_doc["_id"])
         
         # Delete admin user
-        self.admins_collection.delete_one({"_id": ObjectId(org_doc["admin_id"])})
+        await self.admins_collection.delete_one({"_id": ObjectId(org_doc["admin_id"])})
         
         # Delete organization
-        self.organizations_collection.delete_one({"_id": org_doc["_id"]})
+        await self.organizations_collection.delete_one({"_id": org_doc["_id"]})
+        self._invalidate_organization(org_doc["organization_name"], organization_id=str(org_doc["_id"]))
         
         return True
     
-    def authenticate_admin(self, email: str, password: str) -> Optional[Admin]:
-        """Authenticate an admin user"""
-        admin_doc = self.admins_collection.find_one({"email": email})
+    async def authenticate_admin(self, email: str, password: str) -> Optional[Admin]:
+        """
+        Authenticate an admin user.
+        
+        One indexed find_one returns everything login needs, including the
+        organization name kept on the admin document. Admins created before
+        that field existed get it filled in on their first login.
+        
+        A hash stored with a bcrypt cost other than PASSWORD_HASH_ROUNDS is
+        replaced after a successful check, so stored hashes follow the
+        configured cost as admins log in.
+        """
+        admin_doc = await self.admins_collection.find_one({"email": email}, ADMIN_LOGIN_FIELDS)
         if not admin_doc:
             return None
         
         # Verify password
-        if not auth_service.verify_password(password, admin_doc["hashed_password"]):
+        verified, new_hash = await auth_service.verify_and_rehash_async(password, admin_doc["hashed_password"])
+        if not verified:
             return None
         
+        if new_hash:
+            # Conditional on the old hash so a concurrent password change is not overwritten
+            await self.admins_collection.update_one(
+                {"_id": admin_doc["_id"], "hashed_password": admin_doc["hashed_password"]},
+                {"$set": {"hashed_password": new_hash}}
+            )
+            admin_doc["hashed_password"] = new_hash
+        
+        if "organization_name" not in admin_doc:
+            organization = await self.get_organization_by_id(admin_doc["organization_id"])
+            if organization:
+                admin_doc["organization_name"] = organization.organization_name
+                await self.admins_collection.update_one(
+                    {"_id": admin_doc["_id"]},
+                    {"$set": {"organization_name": organization.organization_name}}
+                )
+        
         return Admin.from_dict(admin_doc)
 
 
 # Singleton instance
 organization_service = OrganizationService()
+
+# Each forked worker starts with its own, empty cache
+os.register_at_fork(after_in_child=organization_service.reset_after_fork)
@@ -0,0 +1,285 @@
+import asyncio
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
+from bson import ObjectId, json_util
+from bson.errors import BSONError
+from bson.json_util import RELAXED_JSON_OPTIONS
+from pymongo.errors import BulkWriteError, PyMongoError
+from app.config import settings
+from app.services import organization_service
+from app.placement import placement_router
+from app.tenant_storage import TenantStore, get_tenant_store
+
+
+# Query operators that run server-side JavaScript and are never accepted from clients
+FORBIDDEN_OPERATORS = {"$where", "$function", "$accumulator"}
+
+# Import formats accepted by import_documents
+IMPORT_FORMATS = ("ndjson", "csv")
+
+# At most this many parse/insert error messages are returned from an import
+MAX_REPORTED_IMPORT_ERRORS = 20
+
+
+class TenantNotFoundError(Exception):
+    """Raised when the organization behind a token no longer exists"""
+    pass
+
+
+class TenantDataService:
+    """Service class for an organization's documents, in its own or the shared collection"""
+    
+    async def _store(self, organization_id: str, for_write: bool = False) -> TenantStore:
+        """
+        Resolve where an organization's documents live.
+        
+        The store hides the storage mode: its own collection, or the shared
+        collection where every filter, id and document is scoped to the tenant.
+        Writes check the master database rather than the metadata cache, so an
+        organization deleted through another worker cannot be written to.
+        """
+        if for_write:
+            organization = await organization_service.get_writable_organization(organization_id)
+        else:
+            organization = await organization_service.get_organization_by_id(organization_id)
+        if not organization:
+            raise TenantNotFoundError(organization_id)
+        tenant_db = await placement_router.get_tenant_database(organization_id, for_write=for_write)
+        return await get_tenant_store(
+            organization.storage_mode, organization_id, organization.collection_name, tenant_db
+        )
+    
+    def _document_id(self, document_id: str) -> Any:
+        """Document ids are ObjectIds when they look like one, plain strings otherwise"""
+        return ObjectId(document_id) if ObjectId.is_valid(document_id) else document_id
+    
+    def _from_json(self, value: Any) -> Any:
+        """Convert client JSON (which may use extended JSON such as {"$oid": ...}) to BSON types"""
+        self._check_operators(value)
+        try:
+            return json_util.loads(json.dumps(value))
+        except (BSONError, ValueError, TypeError) as e:
+            raise ValueError(f"Invalid extended JSON: {e}")
+    
+    def _check_operators(self, value: Any):
+        """Reject operators that would execute JavaScript on the server"""
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key in FORBIDDEN_OPERATORS:
+                    raise ValueError(f"Operator {key} is not allowed")
+                self._check_operators(item)
+        elif isinstance(value, list):
+            for item in value:
+                self._check_operators(item)
+    
+    def to_json(self, document: dict) -> dict:
+        """Convert a BSON document to relaxed extended JSON"""
+        return json.loads(json_util.dumps(document, json_options=RELAXED_JSON_OPTIONS))
+    
+    async def insert_document(self, organization_id: str, document: dict) -> str:
+        """Insert a document and return its id"""
+        store = await self._store(organization_id, for_write=True)
+        result = await store.collection.insert_one(store.prepare(self._from_json(document)))
+        return str(store.document_id(result.inserted_id))
+    
+    async def get_document(self, organization_id: str, document_id: str) -> Optional[dict]:
+        """Get a document by id"""
+        store = await self._store(organization_id)
+        document = await store.collection.find_one(store.id_filter(self._document_id(document_id)))
+        return store.present(document) if document is not None else None
+    
+    async def update_document(self, organization_id: str, document_id: str, fields: dict) -> bool:
+        """Set the given fields on a document; returns False if it does not exist"""
+        if "_id" in fields:
+            raise ValueError("_id cannot be updated")
+        store = await self._store(organization_id, for_write=True)
+        result = await store.collection.update_one(
+            store.id_filter(self._document_id(document_id)),
+            {"$set": self._from_json(fields)}
+        )
+        return result.matched_count > 0
+    
+    async def delete_document(self, organization_id: str, document_id: str) -> bool:
+        """Delete a document; returns False if it does not exist"""
+        store = await self._store(organization_id, for_write=True)
+        result = await store.collection.delete_one(store.id_filter(self._document_id(document_id)))
+        return result.deleted_count > 0
+    
+    async def query_documents(
+        self,
+        organization_id: str,
+        filter: Dict[str, Any],
+        projection: Optional[Dict[str, Any]] = None,
+        sort: Optional[Dict[str, int]] = None,
+        limit: int = 100
+    ) -> List[dict]:
+        """Run a filtered query and return at most limit documents"""
+        store = await self._store(organization_id)
+        cursor = store.collection.find(
+            store.filter(self._from_json(filter)),
+            projection=store.projection(self._from_json(projection) if projection else None),
+            sort=store.sort(list(sort.items()) if sort else None),
+            limit=limit
+        )
+        return [store.present(document) for document in await cursor.to_list(None)]
+    
+    async def count_documents(self, organization_id: str, filter: Dict[str, Any]) -> int:
+        """Number of the organization's documents matching filter"""
+        store = await self._store(organization_id)
+        return await store.collection.count_documents(store.filter(self._from_json(filter)))
+    
+    async def export_documents(
+        self,
+        organization_id: str,
+        filter: Dict[str, Any],
+        projection: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream matching documents as NDJSON.
+        
+        Reads from a server-side cursor in batches of TENANT_EXPORT_BATCH_SIZE
+        and yields one chunk per batch, so memory use is bounded by the batch
+        size rather than the result size. The tenant is resolved before the
+        first chunk so a missing tenant still fails the request cleanly.
+        """
+        store = await self._store(organization_id)
+        query = store.filter(self._from_json(filter))
+        projection = store.projection(self._from_json(projection) if projection else None)
+        batch_size = settings.TENANT_EXPORT_BATCH_SIZE
+        
+        async def generate() -> AsyncIterator[str]:
+            lines = []
+            cursor = store.collection.find(query, projection=projection, batch_size=batch_size)
+            async for document in cursor:
+                lines.append(json_util.dumps(store.present(document), json_options=RELAXED_JSON_OPTIONS))
+                if len(lines) >= batch_size:
+                    yield "\n".join(lines) + "\n"
+                    lines = []
+            if lines:
+                yield "\n".join(lines) + "\n"
+        
+        return generate()
+    
+    async def _iter_records(self, chunks: AsyncIterator[bytes], import_format: str) -> AsyncIterator[str]:
+        """
+        Split a byte stream into text records without buffering the whole body.
+        
+        NDJSON records are lines. CSV records are lines joined until their
+        quotes balance, so quoted fields may contain newlines.
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        pending = ""
+        record = ""
+        
+        async def lines() -> AsyncIterator[str]:
+            nonlocal pending
+            async for chunk in chunks:
+                pending += decoder.decode(chunk)
+                *complete, pending = pending.split("\n")
+                for line in complete:
+                    yield line
+            pending += decoder.decode(b"", final=True)
+            if pending:
+                yield pending
+        
+        async for line in lines():
+            if import_format == "csv":
+                record = f"{record}\n{line}" if record else line
+                if record.count('"') % 2:
+                    continue
+                line, record = record, ""
+            if line.strip():
+                yield line.rstrip("\r")
+        if record.strip():
+            yield record
+    
+    async def import_documents(
+        self,
+        organization_id: str,
+        chunks: AsyncIterator[bytes],
+        import_format: str
+    ) -> dict:
+        """
+        Stream NDJSON or CSV records into the tenant collection.
+        
+        Records are parsed as they arrive and written with unordered
+        insert_many batches of TENANT_IMPORT_BATCH_SIZE, with up to
+        TENANT_IMPORT_MAX_IN_FLIGHT batches being written at once. Memory use
+        is bounded by batch size times in-flight batches, not upload size.
+        A batch the database rejects as a whole is counted as failed and the
+        import carries on, so the totals are always returned.
+        CSV values are imported as strings, keyed by the header row.
+        """
+        if import_format not in IMPORT_FORMATS:
+            raise ValueError(f"Unsupported import format: {import_format}")
+        
+        store = await self._store(organization_id, for_write=True)
+        batch_size = settings.TENANT_IMPORT_BATCH_SIZE
+        in_flight = asyncio.Semaphore(settings.TENANT_IMPORT_MAX_IN_FLIGHT)
+        tasks = set()
+        totals = {"inserted": 0, "failed": 0, "errors": []}
+        
+        def record_error(message: str, count: int = 1):
+            totals["failed"] += count
+            if len(totals["errors"]) < MAX_REPORTED_IMPORT_ERRORS:
+                totals["errors"].append(message)
+        
+        async def write_batch(batch: List[dict]):
+            try:
+                result = await store.collection.insert_many(batch, ordered=False)
+                totals["inserted"] += len(result.inserted_ids)
+            except BulkWriteError as e:
+                write_errors = e.details.get("writeErrors", [])
+                totals["inserted"] += e.details.get("nInserted", 0)
+                for error in write_errors:
+                    record_error(error.get("errmsg", "Insert failed"))
+            except PyMongoError as e:
+                # Timeouts, failovers and the like: nothing from this batch is known to be written
+                record_error(f"Batch of {len(batch)} records failed: {e}", count=len(batch))
+            finally:
+                in_flight.release()
+        
+        async def submit(batch: List[dict]):
+            await in_flight.acquire()
+            task = asyncio.create_task(write_batch(batch))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        
+        header = None
+        batch = []
+        line_number = 0
+        async for record in self._iter_records(chunks, import_format):
+            line_number += 1
+            try:
+                if import_format == "csv":
+                    values = next(csv.reader([record]))
+                    if header is None:
+                        header = values
+                        continue
+                    if len(values) != len(header):
+                        raise ValueError(f"expected {len(header)} fields, got {len(values)}")
+                    document = dict(zip(header, values))
+                else:
+                    document = json_util.loads(record)
+                    if not isinstance(document, dict):
+                        raise ValueError("record is not a JSON object")
+            except (ValueError, BSONError, csv.Error) as e:
+                record_error(f"Record {line_number}: {e}")
+                continue
+            
+            batch.append(store.prepare(document))
+            if len(batch) >= batch_size:
+                await submit(batch)
+                batch = []
+        
+        if batch:
+            await submit(batch)
+        if tasks:
+            await asyncio.gather(*tasks)
+        return totals
+
+
+# Singleton instance
+tenant_data_service = TenantDataService()
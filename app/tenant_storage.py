@@ -0,0 +1,169 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+from bson import ObjectId
+from pymongo import ASCENDING
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
+from app.config import settings
+from app.database import db_connection
+
+
+# Storage modes: one collection per tenant, or all tenants in one shared collection
+COLLECTION_MODE = "collection"
+SHARED_MODE = "shared"
+STORAGE_MODES = (COLLECTION_MODE, SHARED_MODE)
+
+# Query operators whose operands are themselves filters
+LOGICAL_OPERATORS = {"$and", "$or", "$nor"}
+
+
+class TenantStore:
+    """
+    Collection-per-tenant storage: the collection holds only this tenant's
+    documents, so filters, ids and documents are used as given.
+    """
+    
+    def __init__(self, collection: AsyncCollection):
+        self.collection = collection
+    
+    def filter(self, query: dict) -> dict:
+        return query
+    
+    def id_filter(self, document_id: Any) -> dict:
+        return {"_id": document_id}
+    
+    def prepare(self, document: dict) -> dict:
+        return document
+    
+    def sort(self, sort: Optional[List[Tuple[str, int]]]) -> Optional[List[Tuple[str, int]]]:
+        return sort
+    
+    def projection(self, projection: Optional[dict]) -> Optional[dict]:
+        return projection
+    
+    def present(self, document: dict) -> dict:
+        return document
+    
+    def document_id(self, stored_id: Any) -> Any:
+        return stored_id
+
+
+class SharedTenantStore(TenantStore):
+    """
+    Shared-collection storage: all tenants' documents in one collection.
+    
+    The stored _id is {"t": <organization id>, "v": <document id>}, so
+    document ids stay scoped to their tenant, lookups by id hit the _id
+    index, and every other query leads on the tenant key via the
+    ("_id.t", "_id.v") compound index. References to _id in filters, sorts
+    and projections are rewritten to _id.v and documents are unwrapped
+    before they are returned ($expr expressions are not rewritten).
+    """
+    
+    def __init__(self, collection: AsyncCollection, organization_id: ObjectId):
+        super().__init__(collection)
+        self.organization_id = organization_id
+    
+    def _field(self, key: str) -> str:
+        if key == "_id" or key.startswith("_id."):
+            return "_id.v" + key[3:]
+        return key
+    
+    def _rewrite(self, query: dict) -> dict:
+        rewritten = {}
+        for key, value in query.items():
+            if key in LOGICAL_OPERATORS and isinstance(value, list):
+                rewritten[key] = [self._rewrite(item) if isinstance(item, dict) else item for item in value]
+            else:
+                rewritten[self._field(key)] = value
+        return rewritten
+    
+    def filter(self, query: dict) -> dict:
+        # Rewritten keys never produce _id.t, so the tenant condition cannot be overridden
+        return {"_id.t": self.organization_id, **self._rewrite(query)}
+    
+    def id_filter(self, document_id: Any) -> dict:
+        return {"_id": {"t": self.organization_id, "v": document_id}}
+    
+    def prepare(self, document: dict) -> dict:
+        document_id = document["_id"] if "_id" in document else ObjectId()
+        prepared = {"_id": {"t": self.organization_id, "v": document_id}}
+        prepared.update((key, value) for key, value in document.items() if key != "_id")
+        return prepared
+    
+    def sort(self, sort: Optional[List[Tuple[str, int]]]) -> Optional[List[Tuple[str, int]]]:
+        return [(self._field(key), direction) for key, direction in sort] if sort else sort
+    
+    def projection(self, projection: Optional[dict]) -> Optional[dict]:
+        # A bare _id keeps its meaning (include or exclude the whole id); sub-paths move under _id.v
+        if not projection:
+            return projection
+        return {(key if key == "_id" else self._field(key)): value for key, value in projection.items()}
+    
+    def present(self, document: dict) -> dict:
+        stored_id = document.pop("_id", None)
+        if isinstance(stored_id, dict) and "v" in stored_id:
+            return {"_id": stored_id["v"], **document}
+        return document
+    
+    def document_id(self, stored_id: Any) -> Any:
+        return stored_id["v"]
+
+
+# (client, database) pairs whose shared collection indexes are known to exist
+_indexed_databases: Set[Tuple[int, str]] = set()
+
+
+async def get_shared_collection(database: AsyncDatabase) -> AsyncCollection:
+    """The shared tenant collection in a database, creating its tenant index on first use"""
+    collection = db_connection.get_collection(settings.TENANT_SHARED_COLLECTION, database)
+    key = (id(database.client), database.name)
+    if key not in _indexed_databases:
+        await collection.create_index([("_id.t", ASCENDING), ("_id.v", ASCENDING)], name="tenant_id")
+        _indexed_databases.add(key)
+    return collection
+
+
+async def get_tenant_store(
+    storage_mode: str,
+    organization_id: Union[str, ObjectId],
+    collection_name: str,
+    database: AsyncDatabase
+) -> TenantStore:
+    """Store for an organization's documents in the given (placement-resolved) database"""
+    if storage_mode == SHARED_MODE:
+        return SharedTenantStore(await get_shared_collection(database), ObjectId(str(organization_id)))
+    return TenantStore(db_connection.get_collection(collection_name, database))
+
+
+def tenant_query(storage_mode: str, organization_id: Union[str, ObjectId]) -> Dict[str, Any]:
+    """Filter selecting all of an organization's stored documents (empty in collection mode)"""
+    if storage_mode == SHARED_MODE:
+        return {"_id.t": ObjectId(str(organization_id))}
+    return {}
+
+
+async def delete_shared_documents(
+    database: AsyncDatabase,
+    organization_id: Union[str, ObjectId],
+    progress: Optional[Callable[[int, int], Awaitable[None]]] = None
+) -> int:
+    """
+    Remove an organization's documents from the shared collection in a database.
+    
+    Deletes one batch of TENANT_COPY_BATCH_SIZE at a time so other tenants'
+    writes are not held up, reporting progress(deleted, total) after each
+    batch. Returns the number of documents deleted.
+    """
+    collection = await get_shared_collection(database)
+    query = tenant_query(SHARED_MODE, organization_id)
+    total = await collection.count_documents(query)
+    deleted = 0
+    while True:
+        batch = await collection.find(query, {"_id": 1}, limit=settings.TENANT_COPY_BATCH_SIZE).to_list(None)
+        if not batch:
+            break
+        result = await collection.delete_many({"_id": {"$in": [doc["_id"] for doc in batch]}})
+        deleted += result.deleted_count
+        if progress:
+            await progress(deleted, total)
+    return deleted
@@ -0,0 +1,60 @@
+"""
+Per-request authentication overhead, with and without the verified-token cache
+
+Times the get_current_admin dependency for the same bearer token, once
+with AuthService.decode_access_token (full HMAC + JSON + TokenData on every
+call) and once with decode_access_token_cached. No database is needed.
+
+Usage:
+    SECRET_KEY=bench python benchmarks/auth_token_cache.py --iterations 100000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+
+from app import dependencies  # noqa: E402
+from app.auth import auth_service  # noqa: E402
+
+
+async def time_dependency(credentials: HTTPAuthorizationCredentials, iterations: int) -> float:
+    """Return mean microseconds per get_current_admin call"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await dependencies.get_current_admin(credentials)
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+async def main(iterations: int):
+    token = auth_service.create_access_token({
+        "admin_id": "65f000000000000000000001",
+        "organization_id": "65f000000000000000000002",
+        "email": "admin@bench.example"
+    })
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    cached = auth_service.decode_access_token_cached
+    try:
+        auth_service.decode_access_token_cached = auth_service.decode_access_token
+        uncached_us = await time_dependency(credentials, iterations)
+    finally:
+        auth_service.decode_access_token_cached = cached
+
+    auth_service.token_cache.clear()
+    cached_us = await time_dependency(credentials, iterations)
+
+    print(f"without cache: {uncached_us:8.2f} us/request")
+    print(f"with cache:    {cached_us:8.2f} us/request")
+    print(f"speedup:       {uncached_us / cached_us:8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
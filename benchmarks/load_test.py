@@ -0,0 +1,186 @@
+"""
+Reproducible HTTP load test for the main endpoints
+
+Boots the service in a subprocess (benchmarks/serve.py), waits for /ready
+and for the demo data to be seeded, then drives each endpoint with
+--concurrency asyncio clients for --duration seconds. Reports requests/second and p50/p95/p99
+latency per endpoint as JSON, together with the microbenchmarks from
+benchmarks/micro.py and the current git commit, so results from two
+commits can be diffed directly.
+
+Endpoints exercised:
+    GET  /org/get      demo organization lookup
+    POST /admin/login  demo admin credentials (bcrypt bound)
+    POST /org/create   unique organization per request (bcrypt bound)
+
+Usage:
+    # against a local mongod (MONGODB_URL in the environment or .env)
+    python benchmarks/load_test.py --output results.json
+    # without MongoDB, using the in-process stand-in
+    python benchmarks/load_test.py --stand-in --output results.json
+    # against an already running instance
+    python benchmarks/load_test.py --url http://localhost:8000
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+
+# Demo data seeded by the service at startup
+DEMO_ORGANIZATION = "TechCorp Solutions"
+DEMO_LOGIN = {"email": "admin@techcorp.com", "password": "TechCorp@2025"}
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def org_get_request(client: httpx.AsyncClient):
+    return client.get("/org/get", params={"organization_name": DEMO_ORGANIZATION})
+
+
+def login_request(client: httpx.AsyncClient):
+    return client.post("/admin/login", json=DEMO_LOGIN)
+
+
+def create_request(client: httpx.AsyncClient):
+    suffix = uuid.uuid4().hex[:12]
+    return client.post("/org/create", json={
+        "organization_name": f"Load {suffix}",
+        "email": f"admin@{suffix}.load.example",
+        "password": "Load@123456"
+    })
+
+
+SCENARIOS = {
+    "GET /org/get": org_get_request,
+    "POST /admin/login": login_request,
+    "POST /org/create": create_request,
+}
+
+
+async def run_scenario(url: str, make_request, concurrency: int, duration: float) -> dict:
+    """Drive one endpoint and summarise latency and throughput"""
+    latencies = []
+    statuses = {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60.0) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await make_request(client)
+                latencies.append(time.perf_counter() - start)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "requests_per_second": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+async def wait_until_ready(url: str, timeout: float = 60.0):
+    """Poll /ready, then the demo login (seeded in the background), until both succeed"""
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=url, timeout=10.0) as client:
+        for make_request in (lambda: client.get("/ready"), lambda: login_request(client)):
+            while True:
+                try:
+                    if (await make_request()).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if time.perf_counter() > deadline:
+                    raise RuntimeError(f"Server at {url} did not become ready within {timeout}s")
+                await asyncio.sleep(0.2)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=REPO_DIR).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def main(args) -> dict:
+    server = None
+    url = args.url
+    if not url:
+        command = [sys.executable, os.path.join(BENCH_DIR, "serve.py"), "--port", str(args.port)]
+        if args.stand_in:
+            command.append("--stand-in")
+        server = subprocess.Popen(command, cwd=REPO_DIR)
+        url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        await wait_until_ready(url)
+        endpoints = {}
+        for name in args.endpoints.split(","):
+            name = name.strip()
+            print(f"Running {name} at concurrency {args.concurrency}...", file=sys.stderr)
+            endpoints[name] = await run_scenario(url, SCENARIOS[name], args.concurrency, args.duration)
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=30)
+
+    results = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "mongodb": "stand-in" if args.stand_in else ("external" if args.url else "MONGODB_URL"),
+        "concurrency": args.concurrency,
+        "duration_seconds": args.duration,
+        "endpoints": endpoints,
+    }
+    if not args.skip_micro:
+        sys.path.insert(0, BENCH_DIR)
+        import micro
+        results["micro"] = micro.run()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Benchmark an already running instance instead of starting one")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--stand-in", action="store_true", help="Use the in-process MongoDB stand-in")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per endpoint")
+    parser.add_argument("--endpoints", default=",".join(SCENARIOS))
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--output", help="Write JSON results to this file as well as stdout")
+    args = parser.parse_args()
+
+    results = asyncio.run(main(args))
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
@@ -0,0 +1,111 @@
+"""
+Login lookup benchmark
+
+Compares the database work behind POST /admin/login, bcrypt excluded:
+
+    two_lookups  find_one on admins (whole document), then find_one on
+                 organizations by id for the organization name (the
+                 previous login path, organization cache cold)
+    one_lookup   a single find_one on admins by email, projected to the
+                 login fields, which now include the organization name
+
+Both run sequentially and concurrently against --tenants admins; latency is
+reported in milliseconds per login.
+
+Usage:
+    MONGODB_URL=mongodb://localhost:27017 SECRET_KEY=bench \
+        python benchmarks/login_pipeline.py [--tenants 1000] [--samples 2000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["MASTER_DB_NAME"] = "bench_login_pipeline"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from bson import ObjectId  # noqa: E402
+from app.database import db_connection  # noqa: E402
+from app.services import ADMIN_LOGIN_FIELDS, organization_service  # noqa: E402
+
+
+def summarize(samples: list) -> dict:
+    samples = sorted(samples)
+    return {
+        "p50": round(samples[len(samples) // 2] * 1000, 3),
+        "p95": round(samples[int(len(samples) * 0.95)] * 1000, 3),
+        "p99": round(samples[int(len(samples) * 0.99)] * 1000, 3),
+        "mean": round(statistics.fmean(samples) * 1000, 3),
+    }
+
+
+async def two_lookups(email: str) -> str:
+    admin_doc = await organization_service.admins_collection.find_one({"email": email})
+    org_doc = await organization_service.organizations_collection.find_one(
+        {"_id": ObjectId(admin_doc["organization_id"])}
+    )
+    return org_doc["organization_name"]
+
+
+async def one_lookup(email: str) -> str:
+    admin_doc = await organization_service.admins_collection.find_one({"email": email}, ADMIN_LOGIN_FIELDS)
+    return admin_doc["organization_name"]
+
+
+async def timed(lookup, email: str) -> float:
+    start = time.perf_counter()
+    await lookup(email)
+    return time.perf_counter() - start
+
+
+async def seed(tenants: int) -> list:
+    db = db_connection.get_master_db()
+    await db.client.drop_database(db.name)
+    db_connection._collections = {}
+    await organization_service.ensure_indexes()
+    org_docs, admin_docs = [], []
+    for i in range(tenants):
+        org_doc, admin_doc = organization_service._build_organization_documents(
+            ObjectId(), ObjectId(), f"Bench Login {i}", f"admin{i}@bench.example",
+            "$2b$12$" + "x" * 53, datetime.utcnow(), "shared"
+        )
+        org_docs.append(org_doc)
+        admin_docs.append(admin_doc)
+    await organization_service.organizations_collection.insert_many(org_docs)
+    await organization_service.admins_collection.insert_many(admin_docs)
+    return [admin_doc["email"] for admin_doc in admin_docs]
+
+
+async def main(args):
+    emails = await seed(args.tenants)
+    results = {"tenants": args.tenants, "samples": args.samples}
+    for name, lookup in (("two_lookups", two_lookups), ("one_lookup", one_lookup)):
+        # Warm the connection pool and the server's cache for both paths alike
+        await asyncio.gather(*[lookup(email) for email in random.sample(emails, min(100, len(emails)))])
+        sequential = [await timed(lookup, random.choice(emails)) for _ in range(args.samples)]
+        concurrent = await asyncio.gather(*[
+            timed(lookup, random.choice(emails)) for _ in range(args.samples)
+        ])
+        results[name] = {"sequential_ms": summarize(sequential), f"concurrent_{args.samples}_ms": summarize(concurrent)}
+    results["saved_p50_ms"] = round(
+        results["two_lookups"]["sequential_ms"]["p50"] - results["one_lookup"]["sequential_ms"]["p50"], 3
+    )
+    db = db_connection.get_master_db()
+    await db.client.drop_database(db.name)
+    await db_connection.close()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenants", type=int, default=1000)
+    parser.add_argument("--samples", type=int, default=2000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
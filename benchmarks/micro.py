@@ -0,0 +1,77 @@
+"""
+Microbenchmarks for hot in-process code paths
+
+Covers AuthService (bcrypt hash/verify, JWT create/decode with and without
+the token cache), Organization.from_dict and OrganizationResponse
+serialization. No database is needed. Prints JSON with mean microseconds
+per call.
+
+Usage:
+    SECRET_KEY=bench python benchmarks/micro.py
+"""
+import json
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from bson import ObjectId  # noqa: E402
+
+from app.auth import auth_service  # noqa: E402
+from app.models import Organization  # noqa: E402
+from app.schemas import OrganizationResponse  # noqa: E402
+
+
+def _mean_us(func, number: int) -> float:
+    """Best-of-three mean microseconds per call"""
+    return round(min(timeit.repeat(func, number=number, repeat=3)) / number * 1_000_000, 3)
+
+
+def run() -> dict:
+    """Run every microbenchmark and return {name: microseconds per call}"""
+    password_hash = auth_service.get_password_hash("Bench@123456")
+    token = auth_service.create_access_token({
+        "admin_id": "65f000000000000000000001",
+        "organization_id": "65f000000000000000000002",
+        "email": "admin@bench.example"
+    })
+    auth_service.decode_access_token_cached(token)
+    org_doc = {
+        "_id": ObjectId(),
+        "organization_name": "Bench Org",
+        "collection_name": "org_bench_org",
+        "admin_id": "65f000000000000000000001",
+        "admin_email": "admin@bench.example",
+        "created_at": datetime.utcnow(),
+        "updated_at": None
+    }
+    organization = Organization.from_dict(org_doc)
+
+    def serialize():
+        OrganizationResponse(
+            organization_id=organization.organization_id,
+            organization_name=organization.organization_name,
+            collection_name=organization.collection_name,
+            admin_email=organization.admin_email,
+            created_at=organization.created_at,
+            updated_at=organization.updated_at
+        ).model_dump_json()
+
+    return {
+        "auth_get_password_hash_us": _mean_us(lambda: auth_service.get_password_hash("Bench@123456"), 5),
+        "auth_verify_password_us": _mean_us(lambda: auth_service.verify_password("Bench@123456", password_hash), 5),
+        "auth_create_access_token_us": _mean_us(
+            lambda: auth_service.create_access_token({"admin_id": "a", "organization_id": "o", "email": "e"}), 2000
+        ),
+        "auth_decode_access_token_us": _mean_us(lambda: auth_service.decode_access_token(token), 2000),
+        "auth_decode_access_token_cached_us": _mean_us(lambda: auth_service.decode_access_token_cached(token), 20000),
+        "organization_from_dict_us": _mean_us(lambda: Organization.from_dict(org_doc), 20000),
+        "organization_response_serialize_us": _mean_us(serialize, 20000),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,67 @@
+"""
+Bulk provisioning benchmark: POST /org/create in a loop vs POST /org/bulk-create
+
+Creates --count organizations each way against a running instance and
+prints organizations/second. Names are prefixed with a run id so repeated
+runs do not collide; delete them afterwards if the database is shared.
+
+Usage:
+    uvicorn app.main:app --port 8000
+    python benchmarks/org_bulk_create.py --url http://localhost:8000 --count 500
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+
+
+def _items(prefix: str, count: int) -> list:
+    return [
+        {
+            "organization_name": f"{prefix} {i}",
+            "email": f"admin{i}@{prefix}.bench.example",
+            "password": "Bench@123456"
+        }
+        for i in range(count)
+    ]
+
+
+async def create_in_loop(client: httpx.AsyncClient, items: list) -> float:
+    start = time.perf_counter()
+    for item in items:
+        response = await client.post("/org/create", json=item)
+        response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def create_in_bulk(client: httpx.AsyncClient, items: list, batch_size: int) -> float:
+    start = time.perf_counter()
+    for offset in range(0, len(items), batch_size):
+        response = await client.post("/org/bulk-create", json={"organizations": items[offset:offset + batch_size]})
+        response.raise_for_status()
+        if response.json()["failed"]:
+            raise RuntimeError(f"bulk create reported failures: {response.json()}")
+    return time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    run_id = uuid.uuid4().hex[:8]
+    async with httpx.AsyncClient(base_url=args.url, timeout=600.0) as client:
+        loop_seconds = await create_in_loop(client, _items(f"loop{run_id}", args.count))
+        bulk_seconds = await create_in_bulk(client, _items(f"bulk{run_id}", args.count), args.batch_size)
+
+    print(f"/org/create loop: {args.count / loop_seconds:8.1f} orgs/s ({loop_seconds:.2f}s)")
+    print(f"/org/bulk-create: {args.count / bulk_seconds:8.1f} orgs/s ({bulk_seconds:.2f}s)")
+    print(f"speedup:          {loop_seconds / bulk_seconds:8.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
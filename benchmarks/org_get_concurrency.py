@@ -0,0 +1,64 @@
+"""
+Concurrency benchmark for GET /org/get
+
+Drives a running instance of the service with an increasing number of
+concurrent clients and prints requests/second at each level. With a
+non-blocking data path, throughput should climb with concurrency until
+MongoDB or the CPU saturates instead of staying flat.
+
+Usage:
+    uvicorn app.main:app --port 8000
+    python benchmarks/org_get_concurrency.py --url http://localhost:8000 \
+        --organization "TechCorp Solutions"
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+
+async def _worker(client: httpx.AsyncClient, organization_name: str, deadline: float) -> int:
+    """Issue requests back to back until the deadline, return the count of 200s"""
+    completed = 0
+    while time.perf_counter() < deadline:
+        response = await client.get("/org/get", params={"organization_name": organization_name})
+        if response.status_code == 200:
+            completed += 1
+    return completed
+
+
+async def run_level(url: str, organization_name: str, concurrency: int, duration: float) -> float:
+    """Run one concurrency level and return requests per second"""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0) as client:
+        # Warm up connections before timing
+        await asyncio.gather(*[
+            client.get("/org/get", params={"organization_name": organization_name})
+            for _ in range(concurrency)
+        ])
+        start = time.perf_counter()
+        deadline = start + duration
+        counts = await asyncio.gather(*[
+            _worker(client, organization_name, deadline) for _ in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - start
+    return sum(counts) / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--organization", default="TechCorp Solutions")
+    parser.add_argument("--levels", default="1,2,4,8,16,32,64")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per concurrency level")
+    args = parser.parse_args()
+
+    print(f"{'concurrency':>12} {'req/s':>10}")
+    for level in [int(value) for value in args.levels.split(",")]:
+        rps = await run_level(args.url, args.organization, level, args.duration)
+        print(f"{level:>12} {rps:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
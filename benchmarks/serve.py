@@ -0,0 +1,76 @@
+"""
+Start the service for benchmarking
+
+Runs app.main:app under uvicorn, either against MONGODB_URL (a real local
+mongod) or, with --stand-in, against an in-process mongomock-motor client
+so the suite can run without MongoDB. Stand-in numbers exercise the API
+and serialization paths only; use a real mongod for database latency.
+
+With --workers N, uvicorn starts N worker processes. Under --stand-in each
+worker has its own in-memory database and seeds its own demo data.
+
+Login rate limiting is off unless RATE_LIMIT_ENABLED is set, since the load
+tests replay the same demo credentials from one address.
+
+Usage:
+    python benchmarks/serve.py --port 8001 [--stand-in] [--workers N]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+
+def install_stand_in():
+    """Point the DatabaseConnection singleton at an in-process mongomock client"""
+    from mongomock_motor import AsyncMongoMockClient
+    from app.config import settings
+    from app.database import db_connection
+
+    client = AsyncMongoMockClient()
+    db_connection._client = client
+    db_connection._master_db = client[settings.MASTER_DB_NAME]
+    db_connection._collections = {}
+
+    async def connect():
+        print("Using in-process MongoDB stand-in")
+
+    async def close():
+        pass
+
+    db_connection.connect = connect
+    db_connection.close = close
+
+
+def create_app():
+    """App factory run in each uvicorn worker process"""
+    if os.environ.get("BENCHMARK_STAND_IN"):
+        install_stand_in()
+    from app.main import app
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--stand-in", action="store_true", help="Use an in-process MongoDB stand-in")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.stand_in:
+        os.environ["BENCHMARK_STAND_IN"] = "1"
+
+    import uvicorn
+    uvicorn.run(
+        "serve:create_app",
+        factory=True,
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level="warning"
+    )
@@ -0,0 +1,102 @@
+"""
+Startup-time benchmark
+
+Measures, over --runs fresh processes:
+    import_ms         time to import app.main (and whether that created a MongoDB client)
+    first_request_ms  process spawn until /health answers 200
+    ready_ms          process spawn until /ready answers 200
+
+Worker boot (first_request_ms) should stay well inside a 1-2 s autoscaler
+budget; ready_ms additionally includes connecting, index provisioning and
+cache warming, which run in the background.
+
+Usage:
+    python benchmarks/startup_time.py [--stand-in] [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+
+IMPORT_PROBE = """
+import time
+start = time.perf_counter()
+import app.main
+from app.database import db_connection
+print(round((time.perf_counter() - start) * 1000, 3), db_connection._client is not None)
+"""
+
+
+def measure_import() -> tuple:
+    """Import app.main in a fresh interpreter; returns (milliseconds, client_created)"""
+    env = dict(os.environ, SECRET_KEY=os.environ.get("SECRET_KEY", "benchmark-secret-key"))
+    output = subprocess.check_output([sys.executable, "-c", IMPORT_PROBE], cwd=REPO_DIR, env=env)
+    elapsed, client_created = output.decode().split()[-2:]
+    return float(elapsed), client_created == "True"
+
+
+def wait_for(client: httpx.Client, path: str, start: float, timeout: float) -> float:
+    """Poll path until it answers 200; returns milliseconds since start"""
+    deadline = start + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if client.get(path).status_code == 200:
+                return round((time.perf_counter() - start) * 1000, 3)
+        except httpx.TransportError:
+            pass
+        time.sleep(0.01)
+    raise RuntimeError(f"{path} did not answer 200 within {timeout}s")
+
+
+def measure_boot(port: int, stand_in: bool, timeout: float) -> dict:
+    """Spawn the server and time the first successful /health and /ready"""
+    command = [sys.executable, os.path.join(BENCH_DIR, "serve.py"), "--port", str(port)]
+    if stand_in:
+        command.append("--stand-in")
+    start = time.perf_counter()
+    server = subprocess.Popen(command, cwd=REPO_DIR, stdout=subprocess.DEVNULL)
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=2.0) as client:
+            first_request = wait_for(client, "/health", start, timeout)
+            ready = wait_for(client, "/ready", start, timeout)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return {"first_request_ms": first_request, "ready_ms": ready}
+
+
+def summarize(values: list) -> dict:
+    return {
+        "median": round(statistics.median(values), 3),
+        "min": round(min(values), 3),
+        "max": round(max(values), 3),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8002)
+    parser.add_argument("--stand-in", action="store_true", help="Use the in-process MongoDB stand-in")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    boots = [measure_boot(args.port, args.stand_in, args.timeout) for _ in range(args.runs)]
+
+    print(json.dumps({
+        "runs": args.runs,
+        "mongodb": "stand-in" if args.stand_in else "MONGODB_URL",
+        "import_ms": summarize([elapsed for elapsed, _ in imports]),
+        "client_created_at_import": any(created for _, created in imports),
+        "first_request_ms": summarize([boot["first_request_ms"] for boot in boots]),
+        "ready_ms": summarize([boot["ready_ms"] for boot in boots]),
+    }, indent=2))
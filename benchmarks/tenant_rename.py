@@ -0,0 +1,120 @@
+"""
+Tenant rename benchmark
+
+Compares three ways of moving a tenant collection to a new name:
+
+    list    - the old approach: list(find({})) followed by insert_many
+    stream  - DatabaseConnection.copy_collection (batched, bounded memory)
+    rename  - DatabaseConnection.rename_collection (server-side renameCollection)
+
+Each measurement runs in a fresh subprocess so peak RSS reflects only that
+strategy. Seeding 10M documents takes a while and several GB of disk.
+
+Usage:
+    MONGODB_URL=mongodb://localhost:27017 SECRET_KEY=bench \
+        python benchmarks/tenant_rename.py --sizes 10000,1000000,10000000
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import db_connection  # noqa: E402
+
+BENCH_DB_NAME = "bench_tenant_rename"
+SOURCE = "org_bench_source"
+TARGET = "org_bench_target"
+STRATEGIES = ["rename", "stream", "list"]
+
+
+def _bench_db():
+    return db_connection.get_master_db().client[BENCH_DB_NAME]
+
+
+async def seed(size: int):
+    """Fill the source collection with size small employee-like documents"""
+    db = _bench_db()
+    await db.drop_collection(SOURCE)
+    await db.drop_collection(TARGET)
+    batch_size = 10_000
+    for start in range(0, size, batch_size):
+        await db[SOURCE].insert_many([
+            {"name": f"Employee {i}", "email": f"emp{i}@bench.example", "department": "Engineering", "n": i}
+            for i in range(start, min(start + batch_size, size))
+        ], ordered=False)
+
+
+async def run_strategy(strategy: str):
+    """Move SOURCE to TARGET with one strategy (runs inside the child process)"""
+    db = _bench_db()
+    if strategy == "rename":
+        await db_connection.rename_collection(SOURCE, TARGET, db)
+    elif strategy == "stream":
+        await db_connection.copy_collection(SOURCE, TARGET, db)
+    else:
+        documents = await db[SOURCE].find({}).to_list(None)
+        if documents:
+            await db[TARGET].insert_many(documents)
+
+
+async def reset(strategy: str):
+    """Put the source collection back for the next strategy"""
+    db = _bench_db()
+    if strategy == "rename":
+        await db[TARGET].rename(SOURCE)
+    else:
+        await db.drop_collection(TARGET)
+
+
+def measure(strategy: str) -> dict:
+    """Run one strategy in a subprocess and return its wall time and peak RSS"""
+    output = subprocess.check_output(
+        [sys.executable, __file__, "--child", strategy],
+        env=os.environ.copy()
+    )
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def child(strategy: str):
+    start = time.perf_counter()
+    asyncio.run(run_strategy(strategy))
+    wall = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"wall_seconds": round(wall, 3), "peak_rss_mb": round(peak_kb / 1024, 1)}))
+
+
+async def main(sizes, strategies):
+    results = []
+    for size in sizes:
+        print(f"Seeding {size} documents...", file=sys.stderr)
+        await seed(size)
+        for strategy in strategies:
+            result = measure(strategy)
+            result.update({"documents": size, "strategy": strategy})
+            results.append(result)
+            print(json.dumps(result))
+            await reset(strategy)
+    await _bench_db().client.drop_database(BENCH_DB_NAME)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,1000000,10000000")
+    parser.add_argument("--strategies", default=",".join(STRATEGIES))
+    parser.add_argument("--child", choices=STRATEGIES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+    else:
+        asyncio.run(main(
+            [int(value) for value in args.sizes.split(",")],
+            args.strategies.split(",")
+        ))
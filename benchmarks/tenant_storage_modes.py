@@ -0,0 +1,181 @@
+"""
+Tenant storage mode benchmark
+
+Compares collection-per-tenant ("collection") with the shared tenant
+collection ("shared") at several tenant counts. For each mode and count a
+fresh database is filled with that many tenants (--docs documents each),
+then it measures:
+
+    create_ms   organization + admin + tenant storage writes (bcrypt excluded)
+    query_ms    TenantDataService.query_documents on a random tenant
+    get_ms      TenantDataService.get_document on a random tenant
+    delete_ms   OrganizationService.delete_organization
+    memory      mongod resident memory and WiredTiger cache bytes, plus
+                collection/index counts and sizes from dbStats
+
+Run against a dedicated mongod: 50k tenants in collection mode creates
+100k+ WiredTiger files. Use an OS limit of at least 200k open files.
+
+Usage:
+    MONGODB_URL=mongodb://localhost:27017 SECRET_KEY=bench \
+        python benchmarks/tenant_storage_modes.py --tenants 1000,10000,50000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["MASTER_DB_NAME"] = "bench_tenant_storage"
+
+from bson import ObjectId  # noqa: E402
+from app.auth import auth_service  # noqa: E402
+from app.database import db_connection  # noqa: E402
+from app.services import organization_service  # noqa: E402
+from app.tenant_data import tenant_data_service  # noqa: E402
+from app import tenant_storage  # noqa: E402
+from app.tenant_storage import get_tenant_store  # noqa: E402
+
+MODES = ["collection", "shared"]
+DEPARTMENTS = ["Engineering", "Marketing", "Sales", "Support"]
+CONCURRENCY = 64
+
+
+def summarize(samples: list) -> dict:
+    samples = sorted(samples)
+    return {
+        "p50": round(samples[len(samples) // 2] * 1000, 3),
+        "p95": round(samples[int(len(samples) * 0.95)] * 1000, 3),
+        "p99": round(samples[int(len(samples) * 0.99)] * 1000, 3),
+        "mean": round(statistics.fmean(samples) * 1000, 3),
+    }
+
+
+async def gather_limited(coroutines):
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def run(coroutine):
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*[run(coroutine) for coroutine in coroutines])
+
+
+def tenant_documents(organization_id: str, docs: int) -> list:
+    return [
+        {"name": f"Employee {i}", "department": DEPARTMENTS[i % len(DEPARTMENTS)], "n": i, "tenant": organization_id}
+        for i in range(docs)
+    ]
+
+
+async def create_tenant(name: str, mode: str, hashed_password: str, docs: int) -> tuple:
+    """Create one tenant through the service write path; returns (seconds, org_doc)"""
+    org_doc, admin_doc = organization_service._build_organization_documents(
+        ObjectId(), ObjectId(), name, f"{name.lower().replace(' ', '')}@bench.example",
+        hashed_password, datetime.utcnow(), mode
+    )
+    start = time.perf_counter()
+    await organization_service._insert_organization(org_doc, admin_doc)
+    elapsed = time.perf_counter() - start
+    if docs:
+        store = await get_tenant_store(mode, org_doc["_id"], org_doc["collection_name"], db_connection.get_master_db())
+        await store.collection.insert_many([store.prepare(document) for document in tenant_documents(str(org_doc["_id"]), docs)])
+    return elapsed, org_doc
+
+
+async def memory_stats() -> dict:
+    db = db_connection.get_master_db()
+    status = await db.client.admin.command("serverStatus")
+    stats = await db.command("dbStats")
+    return {
+        "mongod_resident_mb": status.get("mem", {}).get("resident"),
+        "wiredtiger_cache_mb": round(status.get("wiredTiger", {}).get("cache", {}).get("bytes currently in the cache", 0) / 2 ** 20, 1),
+        "collections": stats.get("collections"),
+        "indexes": stats.get("indexes"),
+        "storage_size_mb": round(stats.get("storageSize", 0) / 2 ** 20, 1),
+        "index_size_mb": round(stats.get("indexSize", 0) / 2 ** 20, 1),
+        "app_peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+async def run(mode: str, tenants: int, docs: int, samples: int) -> dict:
+    db = db_connection.get_master_db()
+    await db.client.drop_database(db.name)
+    db_connection._collections = {}
+    tenant_storage._indexed_databases.clear()
+    organization_service.organization_cache.clear()
+    await organization_service.ensure_indexes()
+    hashed_password = auth_service.get_password_hash("Bench@123456")
+
+    print(f"{mode}: creating {tenants} tenants...", file=sys.stderr)
+    created = await gather_limited([
+        create_tenant(f"Bench {mode} {i}", mode, hashed_password, docs) for i in range(tenants)
+    ])
+    org_docs = [org_doc for _, org_doc in created]
+
+    # Creation latency measured once the database already holds `tenants` tenants
+    create_samples = []
+    for i in range(samples):
+        elapsed, org_doc = await create_tenant(f"Bench {mode} extra {i}", mode, hashed_password, 0)
+        create_samples.append(elapsed)
+        org_docs.append(org_doc)
+
+    query_samples, get_samples = [], []
+    for _ in range(samples):
+        org_doc = random.choice(org_docs[:tenants])
+        organization_id = str(org_doc["_id"])
+        start = time.perf_counter()
+        documents = await tenant_data_service.query_documents(organization_id, {"department": "Sales"}, limit=100)
+        query_samples.append(time.perf_counter() - start)
+        if documents:
+            start = time.perf_counter()
+            await tenant_data_service.get_document(organization_id, str(documents[0]["_id"]))
+            get_samples.append(time.perf_counter() - start)
+
+    memory = await memory_stats()
+
+    delete_samples = []
+    for org_doc in random.sample(org_docs[:tenants], min(samples, tenants)):
+        start = time.perf_counter()
+        await organization_service.delete_organization(str(org_doc["_id"]))
+        delete_samples.append(time.perf_counter() - start)
+
+    return {
+        "mode": mode,
+        "tenants": tenants,
+        "docs_per_tenant": docs,
+        "create_ms": summarize(create_samples),
+        "query_ms": summarize(query_samples),
+        "get_ms": summarize(get_samples) if get_samples else None,
+        "delete_ms": summarize(delete_samples),
+        "memory": memory,
+    }
+
+
+async def main(args):
+    results = []
+    for tenants in [int(value) for value in args.tenants.split(",")]:
+        for mode in args.modes.split(","):
+            result = await run(mode, tenants, args.docs, args.samples)
+            results.append(result)
+            print(json.dumps(result))
+    db = db_connection.get_master_db()
+    await db.client.drop_database(db.name)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenants", default="1000,10000,50000")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--docs", type=int, default=10, help="Documents per tenant")
+    parser.add_argument("--samples", type=int, default=200, help="Timed operations per measurement")
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
@@ -0,0 +1,100 @@
+"""
+Throughput scaling from 1 to N worker processes
+
+For each worker count the service is started fresh, then every endpoint is
+driven at a fixed --concurrency for --duration seconds (using the load test
+scenarios from benchmarks/load_test.py). Reports requests/second per
+endpoint and the speed-up over a single worker.
+
+Against MongoDB (MONGODB_URL) the production entry point is used:
+    gunicorn app.main:app -c gunicorn.conf.py   (with WORKERS=n)
+With --stand-in, benchmarks/serve.py --workers n is used instead; each
+worker then has its own in-memory database.
+
+Usage:
+    python benchmarks/worker_scaling.py [--stand-in] [--max-workers 4]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+
+from load_test import BENCH_DIR, REPO_DIR, SCENARIOS, git_commit, run_scenario, wait_until_ready
+
+
+def start_server(workers: int, port: int, stand_in: bool) -> subprocess.Popen:
+    if stand_in:
+        command = [sys.executable, os.path.join(BENCH_DIR, "serve.py"),
+                   "--port", str(port), "--workers", str(workers), "--stand-in"]
+    else:
+        command = [sys.executable, "-m", "gunicorn", "app.main:app", "-c", "gunicorn.conf.py"]
+    env = dict(os.environ, WORKERS=str(workers), PORT=str(port))
+    env.setdefault("SECRET_KEY", "benchmark-secret-key")
+    return subprocess.Popen(command, cwd=REPO_DIR, env=env)
+
+
+async def measure(workers: int, args) -> dict:
+    server = start_server(workers, args.port, args.stand_in)
+    url = f"http://127.0.0.1:{args.port}"
+    try:
+        await wait_until_ready(url)
+        results = {}
+        for name in args.endpoints.split(","):
+            name = name.strip()
+            print(f"{workers} worker(s): {name} at concurrency {args.concurrency}...", file=sys.stderr)
+            results[name] = await run_scenario(url, SCENARIOS[name], args.concurrency, args.duration)
+        return results
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+async def main(args) -> dict:
+    counts = []
+    workers = 1
+    while workers <= args.max_workers:
+        counts.append(workers)
+        workers *= 2
+    if counts[-1] != args.max_workers:
+        counts.append(args.max_workers)
+
+    runs = {}
+    for count in counts:
+        runs[count] = await measure(count, args)
+
+    baseline = runs[counts[0]]
+    return {
+        "commit": git_commit(),
+        "mongodb": "stand-in" if args.stand_in else "MONGODB_URL",
+        "cpu_count": multiprocessing.cpu_count(),
+        "concurrency": args.concurrency,
+        "duration_seconds": args.duration,
+        "workers": {
+            str(count): {
+                name: {
+                    "requests_per_second": result["requests_per_second"],
+                    "p99_ms": result["p99_ms"],
+                    "speedup": round(result["requests_per_second"] / max(baseline[name]["requests_per_second"], 0.01), 2),
+                    "status_codes": result["status_codes"],
+                }
+                for name, result in results.items()
+            }
+            for count, results in runs.items()
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--port", type=int, default=8003)
+    parser.add_argument("--stand-in", action="store_true", help="Use the in-process MongoDB stand-in")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per endpoint and worker count")
+    parser.add_argument("--endpoints", default="GET /org/get,POST /admin/login")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(main(args)), indent=2))
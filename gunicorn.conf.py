@@ -0,0 +1,40 @@
+"""
+Gunicorn configuration for multi-worker deployments
+
+    gunicorn app.main:app -c gunicorn.conf.py
+
+Runs settings.WORKERS uvicorn workers (0 = one per CPU core). The app is
+imported in each worker after fork (preload_app is off), so every worker
+builds its own MongoDB client, password hashing pool and caches; the
+os.register_at_fork hooks in app/ keep this true even with --preload.
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+from app.config import settings
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = settings.WORKERS or multiprocessing.cpu_count()
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = False
+graceful_timeout = 30
+
+
+def on_starting(server):
+    """Give multi-worker Prometheus metrics a fresh shared directory"""
+    if workers > 1 and settings.METRICS_ENABLED:
+        directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+        if directory:
+            shutil.rmtree(directory, ignore_errors=True)
+            os.makedirs(directory)
+        else:
+            os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+
+
+def child_exit(server, worker):
+    """Drop a dead worker's live gauges from the aggregated metrics"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)